@@ -0,0 +1,283 @@
+"""
+Shared Flask application used by both main.py and app_simple.py
+"""
+
+from flask import Flask, Response, request, session, render_template, redirect, url_for, flash, jsonify
+import os
+import uuid
+import hashlib
+from werkzeug.utils import secure_filename
+from streaming_form_data import StreamingFormDataParser
+from streaming_form_data.targets import FileTarget, ValueTarget
+from streaming_form_data.parser import ParseFailedException
+from zipstream import ZipStream, ZIP_STORED
+import threading
+from utils.task_status import TaskStatusStore, RedisTaskStatusStore
+from utils.pipeline import process_video, process_video_demo
+
+# Offload processing to Celery workers when a broker is configured
+USE_CELERY = False
+if os.environ.get('CELERY_BROKER_URL'):
+    try:
+        from tasks import CeleryStatusStore, process_video_task, process_video_demo_task
+        USE_CELERY = True
+        print("Celery broker configured. Processing runs on Celery workers.")
+    except ImportError as e:
+        print(f"Celery not available: {e}")
+        print("Processing videos in background threads instead.")
+
+# Project root, so templates/ and static/ resolve the same for every entry point
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Allowed file extensions (as returned by os.path.splitext)
+ALLOWED_EXTENSIONS = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm'})
+
+# Read uploads in 1 MiB chunks; tiny reads make multipart parsing CPU-bound
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+SUBTITLE_INSTRUCTIONS = """How to use the subtitles:
+
+1. VLC Player (Recommended):
+   - Open the video file in VLC Player
+   - Go to Subtitle > Add Subtitle File
+   - Select the .srt file
+   - Subtitles will appear automatically!
+
+2. Other Video Players:
+   - Most video players support SRT files
+   - Make sure the video and SRT file have the same name
+   - Place them in the same folder
+
+3. Video Editors:
+   - Import both video and SRT file
+   - The subtitles will be automatically synchronized
+
+Your video now has English subtitles for every spoken word!
+"""
+
+# Instructions for videos whose subtitles were burned in by SUBTITLE_MODE=hardburn
+BURNED_SUBTITLE_INSTRUCTIONS = """About the subtitles:
+
+The subtitles are already burned into the video, so it shows them in any player.
+Do not load the .srt file on top of it, or every line will appear twice.
+
+The .srt file is included for video editors, e.g. to restyle or re-time the subtitles.
+"""
+
+def allowed_file(filename):
+    return os.path.splitext(filename)[1].casefold() in ALLOWED_EXTENSIONS
+
+class HashingFileTarget(FileTarget):
+    """FileTarget that hashes the file contents while they are written to disk"""
+
+    def __init__(self, filename, *args, **kwargs):
+        super().__init__(filename, *args, **kwargs)
+        self.hasher = hashlib.sha256()
+
+    def on_data_received(self, chunk):
+        self.hasher.update(chunk)
+        super().on_data_received(chunk)
+
+def remove_file(path):
+    """Remove a file if it exists"""
+    if os.path.exists(path):
+        os.remove(path)
+
+def create_status_store():
+    """Pick the processing status backend for this deployment"""
+    # Redis shares it across gunicorn and Celery workers; otherwise it lives in this process
+    redis_url = os.environ.get('REDIS_URL')
+    if redis_url:
+        return RedisTaskStatusStore(redis_url)
+    if USE_CELERY:
+        return CeleryStatusStore()
+    return TaskStatusStore()
+
+def create_app(full_processing, max_content_length=10 * 1024 * 1024 * 1024):
+    """Build the web app; full_processing selects the real pipeline over the demo one"""
+    app = Flask(__name__, root_path=ROOT_DIR)
+    app.secret_key = 'your-secret-key-change-this'
+    app.config['MAX_CONTENT_LENGTH'] = max_content_length
+
+    # Create directories under the project root, whatever the working directory is
+    upload_dir = os.path.join(app.root_path, 'static', 'uploads')
+    os.makedirs(upload_dir, exist_ok=True)
+    os.makedirs(os.path.join(app.root_path, 'static', 'processed'), exist_ok=True)
+
+    # Global store to track processing status (notifies SSE listeners on change)
+    processing_status = create_status_store()
+    app.processing_status = processing_status
+
+    @app.route('/')
+    def index():
+        return render_template('index.html')
+
+    @app.route('/upload', methods=['POST'])
+    def upload_file():
+        unique_id = str(uuid.uuid4())
+        partial_path = os.path.join(upload_dir, f"{unique_id}.part")
+
+        file_target = HashingFileTarget(partial_path)
+        source_language_target = ValueTarget()
+        target_language_target = ValueTarget()
+
+        try:
+            # Stream the multipart body straight to disk instead of letting Werkzeug parse it
+            parser = StreamingFormDataParser(headers=request.headers)
+        except (ParseFailedException, ValueError) as e:
+            # Missing or non-multipart Content-Type, so there is no file in the request
+            print(f"Upload parsing error: {e}")
+            flash('No file selected')
+            return redirect(url_for('index'))
+
+        parser.register('file', file_target)
+        parser.register('source_language', source_language_target)
+        parser.register('target_language', target_language_target)
+
+        try:
+            while chunk := request.stream.read(UPLOAD_CHUNK_SIZE):
+                parser.data_received(chunk)
+        except ParseFailedException as e:
+            print(f"Upload parsing error: {e}")
+            remove_file(partial_path)
+            flash('Upload failed. Please try again.')
+            return redirect(url_for('index'))
+        except Exception:
+            remove_file(partial_path)
+            raise
+
+        target_language = target_language_target.value.decode('utf-8') or 'en'
+        source_language = source_language_target.value.decode('utf-8') or 'auto'
+        original_filename = file_target.multipart_filename
+
+        if not original_filename:
+            remove_file(partial_path)
+            flash('No file selected')
+            return redirect(url_for('index'))
+
+        if allowed_file(original_filename):
+            # Re-uploads of a video this client already translated reuse the finished task.
+            # The key is scoped to the session so nobody is handed (and can clean up) another client's task
+            uploader_id = session.setdefault('uploader_id', str(uuid.uuid4()))
+            upload_key = f"{uploader_id}:{file_target.hasher.hexdigest()}:{source_language}:{target_language}"
+            existing_id = processing_status.find_upload(upload_key)
+            existing_status = processing_status.get(existing_id) if existing_id else None
+            if existing_status and existing_status.get('status') == 'completed':
+                print(f"Duplicate upload detected, reusing task {existing_id}")
+                remove_file(partial_path)
+                return redirect(url_for('processing', task_id=existing_id))
+
+            filename = secure_filename(original_filename)
+            file_extension = os.path.splitext(filename)[1].casefold()
+            new_filename = f"{unique_id}{file_extension}"
+
+            filepath = os.path.join(upload_dir, new_filename)
+            os.replace(partial_path, filepath)
+
+            # Initialize processing status
+            processing_status.create(
+                unique_id,
+                status='uploaded',
+                progress=0,
+                message='File uploaded successfully',
+                original_filename=filename,
+                source_language=source_language,
+                target_language=target_language
+            )
+
+            processing_status.remember_upload(upload_key, unique_id)
+
+            # Start processing in background
+            if USE_CELERY:
+                task = process_video_task if full_processing else process_video_demo_task
+                task.apply_async(
+                    args=[unique_id, filepath, source_language, target_language, processing_status.get(unique_id)],
+                    task_id=unique_id
+                )
+            else:
+                target = process_video if full_processing else process_video_demo
+                thread = threading.Thread(target=target, args=(unique_id, filepath, source_language, target_language, processing_status))
+                thread.daemon = True
+                thread.start()
+
+            return redirect(url_for('processing', task_id=unique_id))
+        else:
+            remove_file(partial_path)
+            flash('Invalid file format. Please upload a video file.')
+            return redirect(url_for('index'))
+
+    @app.route('/processing/<task_id>')
+    def processing(task_id):
+        return render_template('processing.html', task_id=task_id)
+
+    @app.route('/status/<task_id>')
+    def status(task_id):
+        return jsonify(processing_status.get(task_id) or {'status': 'not_found'})
+
+    @app.route('/events/<task_id>')
+    def events(task_id):
+        response = Response(processing_status.event_stream(task_id), mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+
+    @app.route('/download/<task_id>')
+    def download(task_id):
+        task_status = processing_status.get(task_id)
+        if task_status and task_status['status'] == 'completed':
+            output_path = task_status['output_path']
+            original_filename = task_status['original_filename']
+
+            # Build the zip (video + subtitle) on the fly while it is sent to the client
+            name_without_ext = os.path.splitext(original_filename)[0]
+            zip_filename = f"{name_without_ext}_with_subtitles.zip"
+
+            # Get paths for video and subtitle
+            srt_path = output_path.replace('.mp4', '.srt')
+
+            # Store file paths for cleanup after download
+            files_to_cleanup = [output_path]
+            if os.path.exists(srt_path):
+                files_to_cleanup.append(srt_path)
+
+            # MP4 is already compressed, so entries are stored; this also makes the size known upfront
+            zip_stream = ZipStream(compress_type=ZIP_STORED, sized=True)
+
+            # Add video file
+            video_name = f"{name_without_ext}_translated.mp4"
+            zip_stream.add_path(output_path, video_name)
+
+            # Add subtitle file if exists
+            if os.path.exists(srt_path):
+                subtitle_name = f"{name_without_ext}_translated.srt"
+                zip_stream.add_path(srt_path, subtitle_name)
+
+            # Add instructions
+            instructions = BURNED_SUBTITLE_INSTRUCTIONS if task_status.get('subtitles_burned') else SUBTITLE_INSTRUCTIONS
+            zip_stream.add(instructions.encode('utf-8'), "README_How_to_use_subtitles.txt")
+
+            # Function to cleanup files after download
+            def cleanup_files():
+                try:
+                    for file_path in files_to_cleanup:
+                        if os.path.exists(file_path):
+                            os.remove(file_path)
+                            print(f"Cleaned up: {file_path}")
+                    # Remove task from processing status
+                    processing_status.delete(task_id)
+                    print(f"Task {task_id} cleaned up successfully")
+                except Exception as e:
+                    print(f"Error during cleanup: {e}")
+
+            response = Response(zip_stream, mimetype='application/zip')
+            response.headers['Content-Disposition'] = f'attachment; filename="{zip_filename}"'
+            response.headers['Content-Length'] = str(len(zip_stream))
+
+            # Cleanup once the whole archive has been streamed
+            response.call_on_close(cleanup_files)
+            return response
+        else:
+            flash('File not ready for download')
+            return redirect(url_for('index'))
+
+    return app
@@ -5,10 +5,54 @@ Real translation script using alternative translation service
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-import time
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
 
+# Number of translation requests in flight at once
+MAX_WORKERS = 8
+
+# Shared HTTP session so every request reuses a keep-alive connection;
+# the pool matches MAX_WORKERS and the adapter backs off on 429/5xx by itself
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504],
+                      raise_on_status=False)
+))
+
+# Persistent translation cache so repeated texts never hit the API twice
+cache_conn = sqlite3.connect('translations.db', check_same_thread=False)
+cache_conn.execute(
+    'CREATE TABLE IF NOT EXISTS translations '
+    '(source_lang TEXT, target_lang TEXT, text TEXT, translated TEXT, '
+    'PRIMARY KEY (source_lang, target_lang, text)) WITHOUT ROWID'
+)
+cache_lock = threading.Lock()
+
+def get_cached_translation(text, source_lang, target_lang):
+    """Look up a previous translation in the cache"""
+    with cache_lock:
+        row = cache_conn.execute(
+            'SELECT translated FROM translations WHERE source_lang=? AND target_lang=? AND text=?',
+            (source_lang, target_lang, text)
+        ).fetchone()
+    return row[0] if row else None
+
+def store_cached_translation(text, source_lang, target_lang, translated):
+    """Save a successful translation in the cache"""
+    with cache_lock:
+        cache_conn.execute(
+            'INSERT OR IGNORE INTO translations VALUES (?, ?, ?, ?)',
+            (source_lang, target_lang, text, translated)
+        )
+        cache_conn.commit()
+
 def translate_with_mymemory(text, source_lang="id", target_lang="en"):
     """Use MyMemory translation API as alternative to Google Translate"""
     try:
@@ -17,6 +61,10 @@ def translate_with_mymemory(text, source_lang="id", target_lang="en"):
         if not text:
             return text
 
+        cached = get_cached_translation(text, source_lang, target_lang)
+        if cached is not None:
+            return cached
+
         # MyMemory API endpoint
         url = f"https://api.mymemory.translated.net/get"
         params = {
@@ -24,48 +72,48 @@ def translate_with_mymemory(text, source_lang="id", target_lang="en"):
             'langpair': f'{source_lang}|{target_lang}'
         }
 
-        response = requests.get(url, params=params, timeout=10)
+        response = session.get(url, params=params, timeout=10)
+
         if response.status_code == 200:
             data = response.json()
             if data['responseStatus'] == 200:
-                return data['responseData']['translatedText']
+                translated = data['responseData']['translatedText']
+                store_cached_translation(text, source_lang, target_lang, translated)
+                return translated
 
         return f"[Translation: {text}]"
     except Exception as e:
         print(f"Translation error: {e}")
         return f"[Translation: {text}]"
 
-def translate_segments_real(segments):
-    """Translate segments with real translation API"""
-    translated = []
+def should_translate(text):
+    """Skip texts that are too short or just punctuation"""
+    return len(text) >= 3 and text not in ['...', '.', '?', '!']
 
-    for i, segment in enumerate(segments):
-        print(f"Translating segment {i+1}/{len(segments)}: {segment['text'][:50]}...")
+def translate_segments_real(segments):
+    """Translate segments with real translation API, each distinct text only once"""
+    texts = [segment['text'].strip() for segment in segments]
+    unique_texts = [text for text in dict.fromkeys(texts) if should_translate(text)]
+    total = len(unique_texts)
+    print(f"Translating {total} unique texts from {len(segments)} segments...")
 
-        # Skip if text is too short or just punctuation
-        text = segment['text'].strip()
-        if len(text) < 3 or text in ['...', '.', '?', '!']:
-            translated.append({
-                'start': segment['start'],
-                'end': segment['end'],
-                'text': text,
-                'original_text': text
-            })
-            continue
+    def translate(item):
+        index, text = item
+        print(f"Translating text {index+1}/{total}: {text[:50]}...")
+        return translate_with_mymemory(text, "id", "en")
 
-        # Translate
-        translated_text = translate_with_mymemory(text, "id", "en")
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        translations = dict(zip(unique_texts, executor.map(translate, enumerate(unique_texts))))
 
+    translated = []
+    for segment, text in zip(segments, texts):
         translated.append({
             'start': segment['start'],
             'end': segment['end'],
-            'text': translated_text,
+            'text': translations.get(text, text),
             'original_text': text
         })
 
-        # Small delay to be respectful to API
-        time.sleep(0.5)
-
     return translated
 
 def create_srt_with_real_translation():
@@ -149,10 +197,11 @@ def create_srt_with_real_translation():
 
 def format_time(seconds):
     """Convert seconds to SRT time format"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millisecs = int((seconds % 1) * 1000)
+    # Round to whole milliseconds once, then split with integer math
+    millisecs = int(round(seconds * 1000))
+    secs, millisecs = divmod(millisecs, 1000)
+    minutes, secs = divmod(secs, 60)
+    hours, minutes = divmod(minutes, 60)
 
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{millisecs:03d}"
 
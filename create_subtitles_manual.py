@@ -6,10 +6,24 @@ Manual subtitle creation script - Generate subtitles from extracted audio
 import os
 import numpy as np
 import subprocess
-import whisper
 from utils.translator import Translator
 from utils.subtitle_generator import SubtitleGenerator
 
+# Number of 30s chunks the openai-whisper fallback decodes per call
+DECODE_BATCH_SIZE = 16
+
+# Windows quieter than this RMS level are treated as silence when detecting the language
+SILENCE_RMS = 1e-3
+
+# Whisper models loaded by this process, reused by every transcription
+_faster_whisper_models = {}
+_whisper_models = {}
+_vad_model = None
+
+def whisper_model_name(language):
+    """Tiny model for fast processing; the English-only tiny.en when the audio is known to be English"""
+    return "tiny.en" if language == "en" else "tiny"
+
 def load_audio_with_librosa(audio_path):
     """Load audio using librosa as alternative to FFmpeg"""
     try:
@@ -21,28 +35,46 @@ def load_audio_with_librosa(audio_path):
         print("librosa not available, trying pydub...")
         return load_audio_with_pydub(audio_path)
 
-def load_audio_with_pydub(audio_path):
-    """Load audio using pydub as alternative"""
+def load_audio_with_soundfile(audio_path):
+    """Load audio as 16kHz mono float32 using soundfile"""
     try:
-        from pydub import AudioSegment
-        import numpy as np
+        import soundfile as sf
+    except ImportError:
+        print("soundfile not available, trying pydub...")
+        return load_audio_with_pydub(audio_path)
 
-        # Load with pydub
-        audio_segment = AudioSegment.from_wav(audio_path)
+    try:
+        # soundfile decodes straight to normalized float32, no intermediate int16 copies
+        audio_data, sample_rate = sf.read(audio_path, dtype='float32', always_2d=False)
 
         # Convert to mono if stereo
-        if audio_segment.channels > 1:
-            audio_segment = audio_segment.set_channels(1)
+        if audio_data.ndim > 1:
+            audio_data = audio_data.mean(axis=1, dtype=np.float32)
 
-        # Convert to 16kHz
-        audio_segment = audio_segment.set_frame_rate(16000)
+        # Convert to 16kHz with a polyphase filter (much cheaper than librosa's default resampler)
+        if sample_rate != 16000:
+            from scipy.signal import resample_poly
+            audio_data = resample_poly(audio_data, 16000, sample_rate).astype(np.float32, copy=False)
 
-        # Convert to numpy array
-        audio_data = np.array(audio_segment.get_array_of_samples())
+        return audio_data
+    except Exception as e:
+        print(f"Error loading audio with soundfile: {e}")
+        return load_audio_with_pydub(audio_path)
+
+def load_audio_with_pydub(audio_path):
+    """Load audio using pydub as fallback"""
+    try:
+        from pydub import AudioSegment
 
-        # Normalize to [-1, 1] range
-        audio_data = audio_data.astype(np.float32) / 32768.0
+        # Load with pydub and convert to 16kHz mono 16-bit samples
+        audio_segment = AudioSegment.from_wav(audio_path)
+        audio_segment = audio_segment.set_channels(1).set_frame_rate(16000).set_sample_width(2)
 
+        # View the raw PCM bytes without copying, then convert and normalize in one pass
+        # straight into the only float32 buffer that gets allocated
+        samples = np.frombuffer(audio_segment.raw_data, dtype=np.int16)
+        audio_data = np.empty(samples.shape, dtype=np.float32)
+        np.multiply(samples, np.float32(1.0 / 32768.0), out=audio_data)
         return audio_data
     except Exception as e:
         print(f"Error loading audio with pydub: {e}")
@@ -53,7 +85,7 @@ def transcribe_audio_manual(audio_path, language="id"):
     print(f"Loading audio manually: {audio_path}")
 
     # Try to load audio with alternative methods
-    audio_data = load_audio_with_pydub(audio_path)
+    audio_data = load_audio_with_soundfile(audio_path)
 
     if audio_data is None:
         raise Exception("Could not load audio file")
@@ -62,62 +94,188 @@ def transcribe_audio_manual(audio_path, language="id"):
     print(f"Audio shape: {audio_data.shape}")
     print(f"Audio duration: {len(audio_data) / 16000:.2f} seconds")
 
-    # Load Whisper model
-    print("Loading Whisper model...")
-    model = whisper.load_model("tiny")  # Use tiny model for faster processing
+    # Prefer faster-whisper (CTranslate2 int8 kernels, built-in VAD segmentation)
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        print("faster-whisper not available, falling back to openai-whisper...")
+        return transcribe_chunks_with_whisper(audio_data, language)
 
-    # Create a custom transcribe using the loaded audio
-    print("Transcribing with Whisper...")
+    model_name = whisper_model_name(language)
+    if model_name not in _faster_whisper_models:
+        print(f"Loading faster-whisper {model_name} model (int8)...")
+        _faster_whisper_models[model_name] = WhisperModel(model_name, device="cpu", compute_type="int8", cpu_threads=os.cpu_count() or 4, num_workers=1)
+    model = _faster_whisper_models[model_name]
+
+    print("Transcribing with faster-whisper...")
+    segments_iter, info = model.transcribe(audio_data, language=language, vad_filter=True, beam_size=1)
+    print(f"Detected language: {info.language}")
 
-    # Pad or trim to 30 seconds chunks for better processing
-    chunk_size = 16000 * 30  # 30 seconds at 16kHz
     segments = []
+    for segment in segments_iter:
+        text = segment.text.strip()
+        if not text:
+            continue
 
-    for i in range(0, len(audio_data), chunk_size):
-        chunk = audio_data[i:i+chunk_size]
+        segments.append({
+            'start': segment.start,
+            'end': segment.end,
+            'text': text,
+            'language': info.language
+        })
+        print(f"  Transcribed: {text[:50]}...")
 
-        # Ensure chunk is not empty
-        if len(chunk) == 0:
-            continue
+    return segments
 
-        # Pad chunk to chunk_size if needed
-        if len(chunk) < chunk_size:
-            chunk = np.pad(chunk, (0, chunk_size - len(chunk)))
+def log_mel_spectrogram_batch(audio_batch, n_mels, window):
+    """Whisper's log-mel for a [B, samples] batch in one STFT, on the batch's device
+    (whisper.audio.mel_filters caches the filterbank per device)"""
+    import torch
+    import whisper
 
-        print(f"Processing chunk {i//chunk_size + 1}...")
+    stft = torch.stft(audio_batch, whisper.audio.N_FFT, whisper.audio.HOP_LENGTH, window=window, return_complex=True)
+    magnitudes = stft[..., :-1].abs() ** 2
 
-        # Transcribe chunk
-        try:
-            # Use Whisper's internal mel spectrogram
-            mel = whisper.log_mel_spectrogram(chunk, model.dims.n_mels)
+    filters = whisper.audio.mel_filters(audio_batch.device, n_mels)
+    mel_spec = filters @ magnitudes
 
-            # Detect language
-            _, probs = model.detect_language(mel)
-            detected_lang = max(probs, key=probs.get)
-            print(f"Detected language: {detected_lang}")
+    log_spec = torch.clamp(mel_spec, min=1e-10).log10()
+    # Clamp the dynamic range per chunk, exactly like whisper.log_mel_spectrogram does for one
+    log_spec = torch.maximum(log_spec, log_spec.amax(dim=(-2, -1), keepdim=True) - 8.0)
+    return (log_spec + 4.0) / 4.0
+
+def speech_windows(audio_data, chunk_size):
+    """Sample ranges of speech found by Silero VAD, packed into windows of at most chunk_size.
+    Without silero-vad the audio is cut into fixed chunk_size windows."""
+    try:
+        import torch
+        from silero_vad import load_silero_vad, get_speech_timestamps
+    except ImportError:
+        print("silero-vad not available, using fixed 30s windows")
+        return [(i, min(i + chunk_size, len(audio_data))) for i in range(0, len(audio_data), chunk_size)]
+
+    global _vad_model
+    if _vad_model is None:
+        _vad_model = load_silero_vad()
+
+    timestamps = get_speech_timestamps(
+        torch.from_numpy(audio_data),
+        _vad_model,
+        sampling_rate=16000,
+        min_silence_duration_ms=100,
+        max_speech_duration_s=chunk_size / 16000
+    )
+
+    # Merge neighbouring speech while it fits one window, so windows only break at silences
+    windows = []
+    for timestamp in timestamps:
+        start, end = timestamp['start'], timestamp['end']
+        if windows and end - windows[-1][0] <= chunk_size:
+            windows[-1][1] = end
+            continue
+        # A single run of speech longer than a window is cut at the window length
+        while end - start > chunk_size:
+            windows.append([start, start + chunk_size])
+            start += chunk_size
+        windows.append([start, end])
+
+    print(f"VAD found {len(timestamps)} speech regions, packed into {len(windows)} windows")
+    return [(start, end) for start, end in windows]
+
+def transcribe_chunks_with_whisper(audio_data, language="id"):
+    """Transcribe the speech windows of loaded audio with openai-whisper, decoding windows in batches"""
+    import torch
+    import whisper
+
+    # Load Whisper model (and the STFT window on its device) once per process
+    model_name = whisper_model_name(language)
+    if model_name not in _whisper_models:
+        if not torch.cuda.is_available():
+            from utils.transcriber import configure_cpu_threads
+            configure_cpu_threads(torch)
+
+        print(f"Loading Whisper {model_name} model...")
+        model = whisper.load_model(model_name)
+        _whisper_models[model_name] = (model, torch.hann_window(whisper.audio.N_FFT, device=model.device))
+    model, window = _whisper_models[model_name]
+
+    # Create a custom transcribe using the loaded audio
+    print("Transcribing with Whisper...")
 
-            # Decode
-            options = whisper.DecodingOptions(
-                language=language,
-                without_timestamps=False,
-                task="transcribe"
-            )
-            result = whisper.decode(model, mel, options)
+    # Whisper's encoder always sees 30 second windows
+    chunk_size = 16000 * 30  # 30 seconds at 16kHz
+    segments = []
 
-            if result.text.strip():
-                start_time = i / 16000
-                end_time = min((i + chunk_size) / 16000, len(audio_data) / 16000)
+    # Copy the audio to the model device once; chunks and mels are then built there
+    audio_tensor = torch.from_numpy(audio_data).to(model.device)
+
+    # Only speech is decoded; each window is padded to 30s just for the mel front-end
+    windows = speech_windows(audio_data, chunk_size)
+    if not windows:
+        print("No speech detected")
+        return segments
+
+    # Trust the requested language; otherwise detect it once on the first window with sound
+    # (detection is a full extra encoder pass, so never repeat it per window; a silent
+    # intro, which the fixed windows without VAD can produce, would give a random language)
+    detected_lang = language
+    if not detected_lang:
+        start, end = next(
+            ((start, end) for start, end in windows
+             if audio_tensor[start:end].square().mean().sqrt() > SILENCE_RMS),
+            windows[0]
+        )
+        first_chunk = whisper.pad_or_trim(audio_tensor[start:end])
+        with torch.inference_mode():
+            mel = log_mel_spectrogram_batch(first_chunk[None], model.dims.n_mels, window)[0]
+            _, probs = model.detect_language(mel)
+        detected_lang = max(probs, key=probs.get)
+        print(f"Detected language: {detected_lang}")
+
+    options = whisper.DecodingOptions(
+        language=detected_lang,
+        without_timestamps=False,
+        task="transcribe",
+        fp16=model.device.type == "cuda"
+    )
+
+    # One [B, 30s] buffer on the device is reused by every batch instead of allocated per batch
+    batch_buffer = torch.empty((min(DECODE_BATCH_SIZE, len(windows)), chunk_size), dtype=torch.float32, device=model.device)
+
+    # Decode several windows per call instead of one window at a time
+    for first in range(0, len(windows), DECODE_BATCH_SIZE):
+        batch_windows = windows[first:first + DECODE_BATCH_SIZE]
+        print(f"Processing windows {first + 1}-{first + len(batch_windows)} of {len(windows)}...")
+
+        # Copy each window in and zero only the padding after its speech
+        batch = batch_buffer[:len(batch_windows)]
+        for row, (start, end) in enumerate(batch_windows):
+            batch[row, :end - start] = audio_tensor[start:end]
+            batch[row, end - start:] = 0
+
+        # Transcribe the batch
+        try:
+            # inference_mode skips all autograd tracking; fp16 decoding is enabled on CUDA
+            with torch.inference_mode():
+                mel = log_mel_spectrogram_batch(batch, model.dims.n_mels, window)
 
+                # Decode every window of the batch in one call
+                results = whisper.decode(model, mel, options)
+        except Exception as e:
+            print(f"Error processing windows: {e}")
+            continue
+
+        for (start, end), result in zip(batch_windows, results):
+            text = result.text.strip()
+            if text:
+                # VAD bounds are absolute, so the subtitle follows the speech itself
                 segments.append({
-                    'start': start_time,
-                    'end': end_time,
-                    'text': result.text.strip(),
+                    'start': start / 16000,
+                    'end': end / 16000,
+                    'text': text,
                     'language': detected_lang
                 })
-                print(f"  Transcribed: {result.text.strip()[:50]}...")
-        except Exception as e:
-            print(f"Error processing chunk: {e}")
-            continue
+                print(f"  Transcribed: {text[:50]}...")
 
     return segments
 
@@ -0,0 +1,26 @@
+"""
+Gunicorn settings for production
+
+Run with:
+    gunicorn -c gunicorn.conf.py main:app
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+
+# Threads hold the long-lived SSE connections and upload streams; heavy work runs elsewhere
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', '32'))
+
+# Without Redis the status store lives in process memory, so only one worker can serve it
+default_workers = multiprocessing.cpu_count() if os.environ.get('REDIS_URL') else 1
+workers = int(os.environ.get('GUNICORN_WORKERS', default_workers))
+
+# Let the kernel spread accepts across workers
+reuse_port = True
+
+# Keep the worker heartbeat file on tmpfs to avoid disk syncs
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
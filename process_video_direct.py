@@ -6,10 +6,6 @@ Direct video processing script - Process your video with real English subtitles
 import os
 import sys
 import time
-from utils.video_processor import VideoProcessor
-from utils.transcriber import Transcriber
-from utils.translator import Translator
-from utils.subtitle_generator import SubtitleGenerator
 
 def process_video_with_subtitles(video_path, output_path):
     """Process video and add English subtitles"""
@@ -18,22 +14,28 @@ def process_video_with_subtitles(video_path, output_path):
     print("=" * 60)
 
     try:
+        # Heavy processing modules are only imported once there is a video to process
+        from utils.video_processor import VideoProcessor
+        from utils.transcriber import get_transcriber
+        from utils.translator import get_translator
+        from utils.subtitle_generator import SubtitleGenerator
+
         # Initialize processors
         print("Initializing processors...")
         video_processor = VideoProcessor()
-        transcriber = Transcriber()
-        translator = Translator()
+        transcriber = get_transcriber()
+        translator = get_translator()
         subtitle_generator = SubtitleGenerator()
 
         # Step 1: Extract audio
         print("Step 1/5: Extracting audio from video...")
-        audio_path = video_processor.extract_audio(video_path)
-        print(f"Audio extracted to: {audio_path}")
+        audio_data = video_processor.extract_audio_array(video_path)
+        print(f"Audio extracted: {len(audio_data) / 16000:.2f}s")
 
         # Step 2: Transcribe speech
         print("Step 2/5: Transcribing speech (this may take a few minutes)...")
         print("   Using OpenAI Whisper for Indonesian speech recognition...")
-        transcription = transcriber.transcribe(audio_path, source_language="id")
+        transcription = transcriber.transcribe_array(audio_data, source_language="id")
         print(f"Found {len(transcription)} speech segments")
 
         # Show sample transcription
@@ -57,16 +59,14 @@ def process_video_with_subtitles(video_path, output_path):
         # Step 5: Add subtitles to video
         print("Step 5/5: Adding subtitles to video...")
         final_output = video_processor.add_subtitles(video_path, srt_path, "final")
+        if not video_processor.subtitles_burned:
+            print(f"   Subtitles are not burned into the video; load {srt_path} in your player")
 
         # Move to desired output location
         if output_path != final_output:
             import shutil
             shutil.move(final_output, output_path)
 
-        # Cleanup temporary files
-        if os.path.exists(audio_path):
-            os.remove(audio_path)
-
         print("=" * 60)
         print(f"SUCCESS! Video with English subtitles saved to:")
         print(f"   {output_path}")
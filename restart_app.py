@@ -3,6 +3,7 @@
 Restart script untuk aplikasi video translation dengan fix ImageMagick
 """
 
+import os
 import subprocess
 import sys
 import time
@@ -21,9 +22,11 @@ def main():
     print("Starting application at http://localhost:5000")
     print("=" * 60)
 
-    # Run the main application
+    # Run the main application with the development server
     try:
-        subprocess.run([sys.executable, "main.py"], check=True)
+        env = dict(os.environ, FLASK_DEV='1')
+        env.setdefault('WHISPER_PRELOAD', '1')
+        subprocess.run([sys.executable, "main.py"], check=True, env=env)
     except KeyboardInterrupt:
         print("\nApplication stopped by user")
     except Exception as e:
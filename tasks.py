@@ -0,0 +1,113 @@
+"""
+Celery tasks for video processing
+
+Start a worker from the project root (uploads are shared through static/):
+    CUDA_VISIBLE_DEVICES=0 WHISPER_PRELOAD=1 celery -A tasks worker -Q gpu --pool=solo --concurrency=1
+    celery -A tasks worker -Q cpu
+"""
+
+import json
+import os
+import time
+from celery import Celery
+from celery.result import AsyncResult
+from celery.signals import worker_process_init
+from utils.task_status import TaskStatusStore, RedisTaskStatusStore
+from utils.pipeline import process_video, process_video_demo
+
+BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', BROKER_URL)
+REDIS_URL = os.environ.get('REDIS_URL')
+
+celery_app = Celery('translate_video', broker=BROKER_URL, backend=RESULT_BACKEND)
+celery_app.conf.update(
+    # Whisper-heavy jobs go to the GPU queue, lightweight jobs to the CPU queue
+    task_routes={
+        'tasks.process_video_task': {'queue': 'gpu'},
+        'tasks.process_video_demo_task': {'queue': 'cpu'},
+    },
+    task_track_started=True,
+    task_acks_late=True,
+    # Few large workers: every job holds a whole video pipeline
+    worker_concurrency=int(os.environ.get('CELERY_WORKER_CONCURRENCY', '2')),
+    worker_prefetch_multiplier=1,
+    result_expires=86400,
+)
+
+@worker_process_init.connect
+def preload_whisper_model(**kwargs):
+    # Pay the model load (and PCIe transfer) at worker boot instead of on the first request;
+    # this is the shared Transcriber that process_video_task runs through the pipeline
+    if os.environ.get('WHISPER_PRELOAD') == '1':
+        from utils.transcriber import get_transcriber
+        get_transcriber().preload()
+
+class CeleryTaskStatus:
+    """Report pipeline progress through the Celery task state"""
+
+    def __init__(self, task, initial_status):
+        self.task = task
+        self.status = dict(initial_status or {})
+
+    def update(self, task_id, **fields):
+        self.status.update(fields)
+        self.task.update_state(task_id=task_id, state='PROGRESS', meta=dict(self.status))
+
+    def get(self, task_id):
+        return dict(self.status)
+
+# With a shared Redis store, workers write progress where every web worker can read it
+redis_status = RedisTaskStatusStore(REDIS_URL) if REDIS_URL else None
+
+def get_task_status(task, initial_status):
+    """Pick where this task reports progress: the shared Redis store or Celery task state"""
+    if redis_status is not None:
+        return redis_status
+    return CeleryTaskStatus(task, initial_status)
+
+class CeleryStatusStore(TaskStatusStore):
+    """Status store for the web process that reads progress from Celery results"""
+
+    def __init__(self, poll_interval=1.0):
+        super().__init__()
+        self.poll_interval = poll_interval
+
+    def get(self, task_id):
+        # Status recorded at upload time covers the window before a worker picks the task up
+        status = super().get(task_id)
+
+        result = AsyncResult(task_id, app=celery_app)
+        if result.state in ('PROGRESS', 'SUCCESS') and isinstance(result.info, dict):
+            status = dict(status or {}, **result.info)
+        elif result.state == 'FAILURE':
+            status = dict(status or {}, status='error', message=f'Error: {result.info}')
+
+        return status
+
+    def delete(self, task_id):
+        super().delete(task_id)
+        AsyncResult(task_id, app=celery_app).forget()
+
+    def wait_for_change(self, task_id, last_version, timeout=15):
+        """Poll the result backend until the task status changes (or timeout)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self.get(task_id)
+            version = json.dumps(status, sort_keys=True)
+            if version != last_version or time.monotonic() >= deadline:
+                return version, status
+            time.sleep(self.poll_interval)
+
+@celery_app.task(bind=True)
+def process_video_task(self, task_id, filepath, source_language, target_language, initial_status=None):
+    """Full processing pipeline running on a Celery worker"""
+    status = get_task_status(self, initial_status)
+    process_video(task_id, filepath, source_language, target_language, status)
+    return status.get(task_id)
+
+@celery_app.task(bind=True)
+def process_video_demo_task(self, task_id, filepath, source_language, target_language, initial_status=None):
+    """Demo pipeline running on a Celery worker"""
+    status = get_task_status(self, initial_status)
+    process_video_demo(task_id, filepath, source_language, target_language, status)
+    return status.get(task_id)
@@ -0,0 +1,4 @@
+import os
+
+# Output folder for subtitles and translated videos, anchored at the project root like the Flask app
+PROCESSED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'processed')
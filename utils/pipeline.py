@@ -0,0 +1,202 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from utils import PROCESSED_DIR
+
+def process_video(task_id, filepath, source_language, target_language, processing_status):
+    """Full video processing with speech recognition and translation"""
+    try:
+        # Heavy processing modules are imported here so the demo path stays dependency-free
+        from utils.video_processor import VideoProcessor
+        from utils.transcriber import get_transcriber
+        from utils.translator import get_translator
+        from utils.subtitle_generator import SubtitleGenerator
+
+        # Update status
+        processing_status.update(
+            task_id,
+            status='processing',
+            progress=10,
+            message='Extracting audio...'
+        )
+
+        # Initialize processors
+        video_processor = VideoProcessor()
+        video_processor.prefetch(filepath)
+        transcriber = get_transcriber(source_language)
+        translator = get_translator()
+        subtitle_generator = SubtitleGenerator()
+
+        # Extract audio straight into memory while the Whisper model is loaded onto the device
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                audio_future = executor.submit(video_processor.extract_audio_array, filepath)
+                transcriber.preload()
+                audio_data = audio_future.result()
+            print(f"Audio extracted: {len(audio_data) / 16000:.2f}s")
+            processing_status.update(task_id, progress=30, message='Transcribing speech...')
+        except Exception as audio_error:
+            print(f"Audio extraction error: {audio_error}")
+            raise Exception(f"Failed to extract audio: {audio_error}")
+
+        # Transcribe audio
+        try:
+            transcription = transcriber.transcribe_array(audio_data, source_language)
+            print(f"Transcription completed with {len(transcription)} segments")
+        except Exception as transcribe_error:
+            print(f"Transcription error: {transcribe_error}")
+            raise Exception(f"Failed to transcribe audio: {transcribe_error}")
+        finally:
+            # A long video's samples are hundreds of MB; don't keep them through translation
+            del audio_data
+        processing_status.update(
+            task_id,
+            progress=60,
+            message=f'Translating to {target_language}...'
+        )
+
+        # Translate to target language
+        translated_segments = translator.translate_segments(transcription, target_language)
+        processing_status.update(task_id, progress=75, message='Optimizing subtitle timing...')
+
+        # Optimize subtitle timing for better audio-video sync
+        optimized_segments = subtitle_generator.normalize(translated_segments)
+
+        processing_status.update(task_id, progress=80, message='Generating subtitles...')
+
+        # Generate subtitle file with optimized timing
+        srt_path = subtitle_generator.create_srt(optimized_segments, task_id)
+        processing_status.update(task_id, progress=90, message='Adding subtitles to video...')
+
+        # Add subtitles to video
+        output_path = video_processor.add_subtitles(filepath, srt_path, task_id)
+
+        # Cleanup temporary files
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+        if video_processor.subtitles_burned:
+            message = 'Video processing completed! Subtitles are burned into the video; the SRT file is included too.'
+            subtitle_info = 'Subtitles are burned into the video. The SRT file is only needed for editing or other players.'
+        elif video_processor.subtitle_mode == 'hardburn':
+            # The ffmpeg burn-in failed and the original video was delivered instead
+            message = 'Video processing completed, but subtitles could not be burned into the video. Download includes video + SRT subtitle file.'
+            subtitle_info = 'Subtitles could not be burned into the video. Open video in VLC Player and load the SRT file for subtitles.'
+        else:
+            message = 'Video processing completed! Download includes video + SRT subtitle file.'
+            subtitle_info = 'Subtitles are provided as separate SRT file. Open video in VLC Player and load the SRT file for subtitles.'
+
+        processing_status.update(
+            task_id,
+            status='completed',
+            progress=100,
+            message=message,
+            output_path=output_path,
+            subtitle_info=subtitle_info,
+            subtitles_burned=video_processor.subtitles_burned
+        )
+
+    except Exception as e:
+        processing_status.update(task_id, status='error', message=f'Error: {str(e)}')
+        print(f"Error processing video {task_id}: {str(e)}")
+
+# Copy granularity for the demo copy loop
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Step messages shown by the demo, keyed by the progress they start at
+DEMO_STEPS = (
+    (10, 'Extracting audio...'),
+    (30, 'Transcribing speech...'),
+    (60, 'Translating to English...'),
+    (80, 'Generating subtitles...'),
+    (90, 'Adding subtitles to video...'),
+)
+
+def copy_with_progress(src, dst, on_progress):
+    """Copy a file in chunks, reporting the copied fraction (0.0 - 1.0) after each chunk"""
+    total = os.path.getsize(src)
+    done = 0
+
+    with open(src, 'rb') as reader, open(dst, 'wb') as writer:
+        # In-kernel copy on Linux; falls back to a read/write loop elsewhere
+        use_copy_file_range = hasattr(os, 'copy_file_range')
+
+        while done < total:
+            copied = 0
+            if use_copy_file_range:
+                try:
+                    copied = os.copy_file_range(reader.fileno(), writer.fileno(), COPY_CHUNK_SIZE)
+                except OSError:
+                    use_copy_file_range = False
+                    reader.seek(done)
+                    writer.seek(done)
+                    continue
+            else:
+                buffer = reader.read(COPY_CHUNK_SIZE)
+                writer.write(buffer)
+                copied = len(buffer)
+
+            if copied == 0:
+                break
+            done += copied
+            on_progress(done / total)
+
+    shutil.copystat(src, dst)
+    if total == 0:
+        on_progress(1.0)
+
+def process_video_demo(task_id, filepath, source_language, target_language, processing_status):
+    """Demo version - creates a sample subtitle and copies the video, reporting real copy progress"""
+    try:
+        processing_status.update(task_id, status='processing', progress=10, message=DEMO_STEPS[0][1])
+
+        # Create sample subtitle file
+        srt_content = """1
+00:00:01,000 --> 00:00:05,000
+Welcome to the video translation demo
+
+2
+00:00:05,000 --> 00:00:10,000
+This is a sample subtitle in English
+
+3
+00:00:10,000 --> 00:00:15,000
+Your video processing is complete!
+
+"""
+        srt_path = os.path.join(PROCESSED_DIR, f'subtitles_{task_id}.srt')
+        with open(srt_path, 'w', encoding='utf-8') as f:
+            f.write(srt_content)
+
+        # For demo, just copy the original file
+        output_filename = f"translated_{task_id}.mp4"
+        output_path = os.path.join(PROCESSED_DIR, output_filename)
+
+        # Copy original file to processed folder; progress follows the bytes copied
+        last_progress = 10
+
+        def report_copy_progress(fraction):
+            nonlocal last_progress
+            progress = 10 + int(80 * fraction)
+            if progress > last_progress:
+                last_progress = progress
+                message = [step for start, step in DEMO_STEPS if start <= progress][-1]
+                processing_status.update(task_id, progress=progress, message=message)
+
+        copy_with_progress(filepath, output_path, report_copy_progress)
+
+        # Cleanup upload file
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+        processing_status.update(
+            task_id,
+            status='completed',
+            progress=100,
+            message='Video processing completed!',
+            output_path=output_path
+        )
+
+    except Exception as e:
+        processing_status.update(task_id, status='error', message=f'Error: {str(e)}')
+        print(f"Error processing video {task_id}: {str(e)}")
@@ -1,9 +1,47 @@
 import os
-from datetime import timedelta
+import numpy as np
+from utils import PROCESSED_DIR
+
+__all__ = ['SubtitleGenerator']
+
+# Segments shorter than this gap apart are pushed clear of each other (20ms)
+OVERLAP_GAP = 0.02
+
+# From this many segments the overlap pass runs compiled with numba (when installed);
+# below it the pure Python loop is cheaper than numba's import and dispatch
+NUMBA_MIN_SEGMENTS = 500
+
+def _fix_overlaps(starts, ends, gap):
+    """Shift overlapping segments in place, keeping their durations; starts/ends are lists or float64 arrays"""
+    count = len(starts)
+    for i in range(count):
+        # Only fix overlaps, preserving the original duration
+        if i > 0 and starts[i] < ends[i - 1]:
+            duration = ends[i] - starts[i]
+            starts[i] = ends[i - 1] + gap
+            ends[i] = starts[i] + duration
+
+        # Keep clear of the (not yet adjusted) next segment
+        if i < count - 1 and ends[i] > starts[i + 1] - gap:
+            ends[i] = starts[i + 1] - gap
+
+# numba is optional and imported on first use, so importing this module stays cheap
+_compiled_fix_overlaps = None
+
+def _get_compiled_fix_overlaps():
+    """Return _fix_overlaps compiled with numba, or None when numba is not installed"""
+    global _compiled_fix_overlaps
+    if _compiled_fix_overlaps is None:
+        try:
+            from numba import njit
+            _compiled_fix_overlaps = njit(cache=True)(_fix_overlaps)
+        except ImportError:
+            _compiled_fix_overlaps = False
+    return _compiled_fix_overlaps or None
 
 class SubtitleGenerator:
     def __init__(self):
-        self.output_dir = 'static/processed'
+        self.output_dir = PROCESSED_DIR
         os.makedirs(self.output_dir, exist_ok=True)
 
     def create_srt(self, translated_segments, task_id):
@@ -11,16 +49,19 @@ class SubtitleGenerator:
         srt_filename = f"subtitles_{task_id}.srt"
         srt_path = os.path.join(self.output_dir, srt_filename)
 
-        with open(srt_path, 'w', encoding='utf-8') as srt_file:
-            for i, segment in enumerate(translated_segments, 1):
-                # Format timestamps
-                start_time = self._seconds_to_srt_time(segment['start'])
-                end_time = self._seconds_to_srt_time(segment['end'])
+        # Build the whole file in memory and write it once
+        parts = []
+        append = parts.append
 
-                # Write SRT entry
-                srt_file.write(f"{i}\n")
-                srt_file.write(f"{start_time} --> {end_time}\n")
-                srt_file.write(f"{segment['text']}\n\n")
+        # Format all timestamps at once
+        start_times = self._format_timestamps([segment['start'] for segment in translated_segments], ',')
+        end_times = self._format_timestamps([segment['end'] for segment in translated_segments], ',')
+
+        for i, (segment, start_time, end_time) in enumerate(zip(translated_segments, start_times, end_times), 1):
+            # SRT entry
+            append(f"{i}\n{start_time} --> {end_time}\n{segment['text']}\n\n")
+
+        self._write_file(srt_path, ''.join(parts))
 
         return srt_path
 
@@ -29,57 +70,86 @@ class SubtitleGenerator:
         vtt_filename = f"subtitles_{task_id}.vtt"
         vtt_path = os.path.join(self.output_dir, vtt_filename)
 
-        with open(vtt_path, 'w', encoding='utf-8') as vtt_file:
-            vtt_file.write("WEBVTT\n\n")
-
-            for segment in translated_segments:
-                # Format timestamps for VTT
-                start_time = self._seconds_to_vtt_time(segment['start'])
-                end_time = self._seconds_to_vtt_time(segment['end'])
+        # Build the whole file in memory and write it once
+        parts = ["WEBVTT\n\n"]
+        append = parts.append
 
-                # Write VTT entry
-                vtt_file.write(f"{start_time} --> {end_time}\n")
-                vtt_file.write(f"{segment['text']}\n\n")
+        # Format all timestamps for VTT at once
+        start_times = self._format_timestamps([segment['start'] for segment in translated_segments], '.')
+        end_times = self._format_timestamps([segment['end'] for segment in translated_segments], '.')
 
-        return vtt_path
-
-    def _seconds_to_srt_time(self, seconds):
-        """Convert seconds to SRT time format (HH:MM:SS,mmm)"""
-        td = timedelta(seconds=seconds)
-        hours, remainder = divmod(td.total_seconds(), 3600)
-        minutes, seconds = divmod(remainder, 60)
-        milliseconds = int((seconds % 1) * 1000)
+        for segment, start_time, end_time in zip(translated_segments, start_times, end_times):
+            # VTT entry
+            append(f"{start_time} --> {end_time}\n{segment['text']}\n\n")
 
-        return f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d},{milliseconds:03d}"
+        self._write_file(vtt_path, ''.join(parts))
 
-    def _seconds_to_vtt_time(self, seconds):
-        """Convert seconds to VTT time format (HH:MM:SS.mmm)"""
-        td = timedelta(seconds=seconds)
-        hours, remainder = divmod(td.total_seconds(), 3600)
-        minutes, seconds = divmod(remainder, 60)
-        milliseconds = int((seconds % 1) * 1000)
+        return vtt_path
 
-        return f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}.{milliseconds:03d}"
+    def _write_file(self, path, content):
+        """Write a rendered subtitle file as UTF-8 straight to the raw file descriptor"""
+        data = memoryview(content.encode('utf-8'))
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            # os.write may stop short on large buffers, so keep going until everything is out
+            while data:
+                written = os.write(fd, data)
+                data = data[written:]
+        finally:
+            os.close(fd)
+
+    def _format_timestamps(self, seconds, separator):
+        """Convert a column of seconds to HH:MM:SS<separator>mmm strings with NumPy integer math"""
+        milliseconds = np.rint(np.asarray(seconds, dtype=np.float64) * 1000).astype(np.int64)
+        hours, milliseconds = np.divmod(milliseconds, 3600000)
+        minutes, milliseconds = np.divmod(milliseconds, 60000)
+        secs, milliseconds = np.divmod(milliseconds, 1000)
+
+        return [
+            f"{h:02d}:{m:02d}:{s:02d}{separator}{ms:03d}"
+            for h, m, s, ms in zip(hours.tolist(), minutes.tolist(), secs.tolist(), milliseconds.tolist())
+        ]
+
+    def normalize(self, segments, min_duration=1.2, max_chars=60, max_duration=4.0):
+        """Merge short segments, split long ones, then fix overlaps with the shared _fix_overlaps pass"""
+        merged = self._iter_merged(segments, min_duration, max_chars)
+        # _iter_split yields fresh dicts, so the overlap pass can adjust them in place
+        split_segments = list(self._iter_split(merged, max_chars, max_duration))
+        self._fix_overlapping_times(split_segments)
+        return split_segments
 
     def merge_short_segments(self, segments, min_duration=1.2, max_chars=60):
         """Merge short segments for better readability with improved timing for better sync"""
-        merged_segments = []
+        return list(self._iter_merged(segments, min_duration, max_chars))
+
+    def _iter_merged(self, segments, min_duration, max_chars):
+        """Yield segments with short neighbours merged together"""
         current_segment = None
 
+        # Texts of the merged run, with its joined length and word count kept as running totals
+        current_texts = []
+        current_length = 0
+        word_count = 0
+
         for segment in segments:
             duration = segment['end'] - segment['start']
+            text = segment['text']
 
             if current_segment is None:
                 current_segment = segment.copy()
+                current_texts = [text]
+                current_length = len(text)
+                word_count = len(text.split())
             elif (duration < min_duration and
-                  len(current_segment['text'] + ' ' + segment['text']) <= max_chars and
+                  current_length + 1 + len(text) <= max_chars and
                   segment['start'] - current_segment['end'] < 0.5):  # Smaller gap for better sync
                 # Merge with current segment
-                current_segment['text'] += ' ' + segment['text']
+                current_texts.append(text)
+                current_length += 1 + len(text)
+                word_count += len(text.split())
                 current_segment['end'] = segment['end']
 
                 # More conservative timing based on actual speech patterns
-                word_count = len(current_segment['text'].split())
                 reading_speed = 2.5  # Slower reading speed for better sync
                 optimal_duration = max(min_duration, word_count / reading_speed)
 
@@ -90,30 +160,37 @@ class SubtitleGenerator:
                     current_segment['end'] += extension
             else:
                 # Save current segment and start new one
-                merged_segments.append(current_segment)
+                current_segment['text'] = ' '.join(current_texts)
+                yield current_segment
                 current_segment = segment.copy()
+                current_texts = [text]
+                current_length = len(text)
+                word_count = len(text.split())
 
         if current_segment:
-            merged_segments.append(current_segment)
-
-        return merged_segments
+            current_segment['text'] = ' '.join(current_texts)
+            yield current_segment
 
     def split_long_segments(self, segments, max_chars=60, max_duration=4.0):
         """Split long segments for better readability with preserved original timing"""
-        split_segments = []
+        split_segments = list(self._iter_split(segments, max_chars, max_duration))
+
+        # Minimal timing optimization to prevent overlaps only
+        return self._preserve_original_timing(split_segments)
 
+    def _iter_split(self, segments, max_chars, max_duration):
+        """Yield segments with long ones split into readable pieces"""
         for segment in segments:
             text = segment['text']
             duration = segment['end'] - segment['start']
 
             if len(text) <= max_chars and duration <= max_duration:
                 # Keep original timing for segments that don't need splitting
-                split_segments.append(segment.copy())
+                yield segment.copy()
                 continue
 
             # Split long text while preserving original timing proportions
             words = text.split()
-            current_text = ""
             word_positions = []
 
             # Calculate word positions within the original segment timing
@@ -130,15 +207,17 @@ class SubtitleGenerator:
                     'end': word_end_time
                 })
 
-            # Group words into appropriately sized segments
+            # Group words into appropriately sized segments, tracking the joined length
             current_words = []
+            current_length = 0
             current_start_time = None
 
             for word_info in word_positions:
-                test_text = current_text + (' ' + word_info['word'] if current_text else word_info['word'])
+                word_length = len(word_info['word'])
+                new_length = current_length + 1 + word_length if current_words else word_length
 
-                if len(test_text) <= max_chars:
-                    current_text = test_text
+                if new_length <= max_chars:
+                    current_length = new_length
                     current_words.append(word_info)
                     if current_start_time is None:
                         current_start_time = word_info['start']
@@ -147,64 +226,59 @@ class SubtitleGenerator:
                         # Create segment with original timing
                         current_end_time = current_words[-1]['end']
 
-                        split_segments.append({
+                        yield {
                             'start': current_start_time,
                             'end': current_end_time,
-                            'text': current_text.strip(),
+                            'text': ' '.join(info['word'] for info in current_words),
                             'original_text': segment.get('original_text', text),
                             'confidence': segment.get('confidence', 0.0)
-                        })
+                        }
 
                         # Start new segment
-                        current_text = word_info['word']
                         current_words = [word_info]
+                        current_length = word_length
                         current_start_time = word_info['start']
 
             # Add final segment if any words remain
             if current_words:
                 current_end_time = current_words[-1]['end']
 
-                split_segments.append({
+                yield {
                     'start': current_start_time,
                     'end': current_end_time,
-                    'text': current_text.strip(),
+                    'text': ' '.join(info['word'] for info in current_words),
                     'original_text': segment.get('original_text', text),
                     'confidence': segment.get('confidence', 0.0)
-                })
-
-        # Minimal timing optimization to prevent overlaps only
-        return self._preserve_original_timing(split_segments)
+                }
 
     def _preserve_original_timing(self, segments):
         """Preserve original timing while preventing overlaps minimally"""
         if not segments:
             return segments
 
-        optimized = []
-
-        for i, segment in enumerate(segments):
-            current_segment = segment.copy()
-
-            # Only fix overlaps, preserve original timing as much as possible
-            if optimized and current_segment['start'] < optimized[-1]['end']:
-                # Minimal adjustment - just prevent overlap
-                gap = 0.02  # Very small gap (20ms)
-                current_segment['start'] = optimized[-1]['end'] + gap
-
-                # Maintain original duration if possible
-                original_duration = segment['end'] - segment['start']
-                current_segment['end'] = current_segment['start'] + original_duration
-
-            # Prevent overlap with next segment with minimal adjustment
-            if i < len(segments) - 1:
-                next_start = segments[i + 1]['start']
-                if current_segment['end'] > next_start - 0.02:
-                    current_segment['end'] = next_start - 0.02
-
-            optimized.append(current_segment)
-
+        optimized = [segment.copy() for segment in segments]
+        self._fix_overlapping_times(optimized)
         return optimized
 
+    def _fix_overlapping_times(self, segments):
+        """Run the overlap pass over the segments' start/end times and write them back in place"""
+        starts = [segment['start'] for segment in segments]
+        ends = [segment['end'] for segment in segments]
+
+        compiled = _get_compiled_fix_overlaps() if len(segments) >= NUMBA_MIN_SEGMENTS else None
+        if compiled is not None:
+            starts = np.array(starts, dtype=np.float64)
+            ends = np.array(ends, dtype=np.float64)
+            compiled(starts, ends, OVERLAP_GAP)
+            starts = starts.tolist()
+            ends = ends.tolist()
+        else:
+            _fix_overlaps(starts, ends, OVERLAP_GAP)
+
+        for segment, start, end in zip(segments, starts, ends):
+            segment['start'] = start
+            segment['end'] = end
+
     def _optimize_single_segment_timing(self, segment):
         """Minimal optimization - preserve original timing"""
         return segment.copy()
@@ -0,0 +1,226 @@
+import json
+import threading
+import time
+
+class TaskStatusStore:
+    """Thread-safe processing status store that notifies listeners on every update"""
+
+    def __init__(self):
+        self._tasks = {}
+        self._versions = {}
+        self._conditions = {}
+        self._uploads = {}
+        self._lock = threading.Lock()
+
+    def _condition(self, task_id, create=False):
+        """Get (or create) the condition variable guarding a single task"""
+        with self._lock:
+            cond = self._conditions.get(task_id)
+            if cond is None and create:
+                cond = threading.Condition()
+                self._conditions[task_id] = cond
+            return cond
+
+    def create(self, task_id, **fields):
+        """Register a new task with its initial status fields"""
+        cond = self._condition(task_id, create=True)
+        with cond:
+            self._tasks[task_id] = dict(fields)
+            self._versions[task_id] = 0
+            cond.notify_all()
+
+    def update(self, task_id, **fields):
+        """Update status fields of a task and wake up every waiting listener"""
+        cond = self._condition(task_id)
+        if cond is None:
+            return
+        with cond:
+            if task_id not in self._tasks:
+                return
+            self._tasks[task_id].update(fields)
+            self._versions[task_id] += 1
+            cond.notify_all()
+
+    def get(self, task_id):
+        """Return a snapshot of the task status, or None if the task is unknown"""
+        cond = self._condition(task_id)
+        if cond is None:
+            return None
+        with cond:
+            status = self._tasks.get(task_id)
+            return dict(status) if status is not None else None
+
+    def delete(self, task_id):
+        """Forget a task and release anyone still listening for it"""
+        cond = self._condition(task_id)
+        if cond is None:
+            return
+        with cond:
+            self._tasks.pop(task_id, None)
+            self._versions.pop(task_id, None)
+            cond.notify_all()
+        with self._lock:
+            self._conditions.pop(task_id, None)
+            for upload_key in [key for key, value in self._uploads.items() if value == task_id]:
+                del self._uploads[upload_key]
+
+    def remember_upload(self, upload_key, task_id):
+        """Map the content hash of an upload to the task processing it"""
+        with self._lock:
+            self._uploads[upload_key] = task_id
+
+    def find_upload(self, upload_key):
+        """Return the task id that processed an identical upload, if any"""
+        with self._lock:
+            return self._uploads.get(upload_key)
+
+    def wait_for_change(self, task_id, last_version, timeout=15):
+        """Block until the task changes past last_version (or timeout) and return (version, status)"""
+        cond = self._condition(task_id)
+        if cond is None:
+            return -1, None
+        with cond:
+            cond.wait_for(
+                lambda: self._versions.get(task_id, -1) != last_version,
+                timeout=timeout
+            )
+            status = self._tasks.get(task_id)
+            version = self._versions.get(task_id, -1)
+            return version, (dict(status) if status is not None else None)
+
+    def event_stream(self, task_id, timeout=15):
+        """Yield Server-Sent Events with the task status each time it changes"""
+        last_version = None
+        while True:
+            version, status = self.wait_for_change(task_id, last_version, timeout)
+
+            if status is None:
+                yield f"data: {json.dumps({'status': 'not_found'})}\n\n"
+                return
+
+            if version == last_version:
+                # Nothing changed, keep the connection alive through proxies
+                yield ": keep-alive\n\n"
+                continue
+
+            last_version = version
+            yield f"data: {json.dumps(status)}\n\n"
+
+            if status.get('status') in ('completed', 'error'):
+                return
+
+class RedisTaskStatusStore(TaskStatusStore):
+    """Processing status kept in Redis hashes so every web and Celery worker sees the same state"""
+
+    def __init__(self, redis_url, expire_seconds=86400):
+        import redis
+
+        self.redis = redis.Redis.from_url(redis_url)
+        self.expire_seconds = expire_seconds
+
+    def _key(self, task_id):
+        return f'task:{task_id}'
+
+    def _channel(self, task_id):
+        return f'task:{task_id}:events'
+
+    def create(self, task_id, **fields):
+        key = self._key(task_id)
+        pipe = self.redis.pipeline()
+        pipe.delete(key)
+        pipe.hset(key, mapping={name: json.dumps(value) for name, value in fields.items()})
+        pipe.hset(key, '_version', 0)
+        pipe.expire(key, self.expire_seconds)
+        pipe.publish(self._channel(task_id), 0)
+        pipe.execute()
+
+    def update(self, task_id, **fields):
+        if not fields:
+            return
+        key = self._key(task_id)
+        mapping = {name: json.dumps(value) for name, value in fields.items()}
+
+        def apply(pipe):
+            # The key is WATCHed: a delete (or another update) before EXEC makes redis-py retry
+            if not pipe.exists(key):
+                return
+            pipe.multi()
+            pipe.hset(key, mapping=mapping)
+            pipe.hincrby(key, '_version', 1)
+            pipe.expire(key, self.expire_seconds)
+            pipe.publish(self._channel(task_id), 1)
+
+        self.redis.transaction(apply, key)
+
+    def _snapshot(self, task_id):
+        """Return (version, status) read atomically from the task hash"""
+        raw = self.redis.hgetall(self._key(task_id))
+        if not raw:
+            return -1, None
+        version = int(raw.pop(b'_version', 0))
+        status = {name.decode('utf-8'): json.loads(value) for name, value in raw.items()}
+        return version, status
+
+    def get(self, task_id):
+        return self._snapshot(task_id)[1]
+
+    def remember_upload(self, upload_key, task_id):
+        self.redis.setex(f'upload:{upload_key}', self.expire_seconds, task_id)
+
+    def find_upload(self, upload_key):
+        task_id = self.redis.get(f'upload:{upload_key}')
+        return task_id.decode('utf-8') if task_id else None
+
+    def delete(self, task_id):
+        self.redis.delete(self._key(task_id))
+        self.redis.publish(self._channel(task_id), -1)
+
+    def _wait_for_message(self, pubsub, timeout):
+        """Block until a notification arrives on the subscribed channel (or timeout)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            # Subscribe confirmations come back as None and are skipped
+            if pubsub.get_message(timeout=remaining) is not None:
+                return True
+
+    def wait_for_change(self, task_id, last_version, timeout=15):
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self._channel(task_id))
+        try:
+            version, status = self._snapshot(task_id)
+            if version == last_version:
+                self._wait_for_message(pubsub, timeout)
+                version, status = self._snapshot(task_id)
+            return version, status
+        finally:
+            pubsub.close()
+
+    def event_stream(self, task_id, timeout=15):
+        """Yield Server-Sent Events driven by Redis pub/sub notifications"""
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self._channel(task_id))
+        try:
+            last_version = None
+            while True:
+                version, status = self._snapshot(task_id)
+
+                if status is None:
+                    yield f"data: {json.dumps({'status': 'not_found'})}\n\n"
+                    return
+
+                if version == last_version:
+                    yield ": keep-alive\n\n"
+                else:
+                    last_version = version
+                    yield f"data: {json.dumps(status)}\n\n"
+
+                    if status.get('status') in ('completed', 'error'):
+                        return
+
+                # Sleep until the worker publishes the next update
+                self._wait_for_message(pubsub, timeout)
+        finally:
+            pubsub.close()
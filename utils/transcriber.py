@@ -1,30 +1,350 @@
-import whisper
 import os
-import torch
+import threading
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# Default checkpoints: large-v3-turbo (4 decoder layers) keeps large-v3 quality at a
+# fraction of its decode time on GPU; base stays the practical choice on CPU
+DEFAULT_GPU_MODEL = "large-v3-turbo"
+DEFAULT_CPU_MODEL = "base"
+
+# Checkpoints with an English-only ".en" variant: smaller vocabulary, lower WER on English
+ENGLISH_ONLY_MODELS = frozenset({"tiny", "base", "small", "medium"})
+
+# Files transcribed concurrently by Transcriber.transcribe_files (faster-whisper workers)
+WHISPER_NUM_WORKERS = max(1, int(os.environ.get("WHISPER_NUM_WORKERS", "1")))
+
+# Loaded models keyed by (backend, model_id, device, compute_type), shared by every Transcriber
+_MODEL_CACHE = {}
+_MODEL_LOCK = threading.RLock()
+_shared_transcribers = {}
+
+def configure_cpu_threads(torch):
+    """Keep PyTorch's CPU matmuls on a few threads; past ~4 they contend and throughput drops.
+    One Whisper call already uses these threads, so don't also fan chunks out over threads.
+    OMP_NUM_THREADS / MKL_NUM_THREADS, when set, take precedence."""
+    if os.environ.get("OMP_NUM_THREADS") or os.environ.get("MKL_NUM_THREADS"):
+        return
+
+    torch.set_num_threads(min(4, os.cpu_count() or 4))
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only allowed before the first inter-op parallel work of the process
+        pass
 
 class Transcriber:
-    def __init__(self):
-        # Use GPU if available, otherwise CPU
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        print(f"Using device: {self.device}")
-
-        # Load Whisper model (base model for good balance of speed and accuracy)
-        print("Loading Whisper model...")
+    def __init__(self, model_id=None, english_only=False):
+        # torch/whisper are imported on first use, so the device is resolved with the model
+        self.device = None
+        self.model_id = model_id
+        # Audio known to be English may use the ".en" variant of the default model
+        self.english_only = english_only
+
+        # Whisper model is loaded lazily by _ensure_model_loaded
         self.model = None
+        self.backend = None
+        self.batched_model = None
+        self.vad_model = None
+        # Silero VAD keeps recurrent state between frames, so one file at a time
+        self._vad_lock = threading.Lock()
+        # Shared with every Transcriber using the same cached model
+        self._model_lock = None
+        self._fp16 = False
+        self._whisper_kwargs = None
+        self.batch_size = int(os.environ.get("WHISPER_BATCH_SIZE", "16"))
+
+    @classmethod
+    def get_shared(cls, english_only=False):
+        """Return the process-wide Transcriber, so every video reuses one loaded model"""
+        with _MODEL_LOCK:
+            if english_only not in _shared_transcribers:
+                _shared_transcribers[english_only] = cls(english_only=english_only)
+            return _shared_transcribers[english_only]
+
+    def preload(self):
+        """Load the model now instead of on the first transcription"""
+        self._ensure_model_loaded()
+        return self
 
     def _ensure_model_loaded(self):
         """Lazy load the model to avoid initialization issues"""
-        if self.model is None:
-            print("Loading Whisper base model for better accuracy and timing...")
-            self.model = whisper.load_model("base", device=self.device)
-            print("Whisper model loaded successfully")
+        if self.model is not None:
+            return
+
+        with _MODEL_LOCK:
+            if self.model is not None:
+                return
+
+            import torch
+
+            # Use GPU if available, otherwise CPU
+            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            print(f"Using device: {self.device}")
+
+            if self.device == "cpu":
+                configure_cpu_threads(torch)
+
+            # openai-whisper decoding options, built once now that the device is known
+            self._fp16 = self.device == "cuda"
+            self._whisper_kwargs = dict(
+                word_timestamps=True,
+                temperature=0.0,
+                best_of=1,
+                beam_size=1,
+                patience=1.0,
+                length_penalty=1.0,
+                suppress_tokens="-1",
+                initial_prompt=None,
+                condition_on_previous_text=True,
+                fp16=self._fp16,
+                compression_ratio_threshold=2.4,
+                logprob_threshold=-1.0,
+                no_speech_threshold=0.6
+            )
+
+            # Model can be overridden per instance or with the WHISPER_MODEL environment variable
+            default_model = DEFAULT_GPU_MODEL if self.device == "cuda" else DEFAULT_CPU_MODEL
+            if self.english_only and default_model in ENGLISH_ONLY_MODELS:
+                default_model = f"{default_model}.en"
+            self.model_id = self.model_id or os.environ.get("WHISPER_MODEL") or default_model
+
+            # faster-whisper (CTranslate2) is the preferred backend; openai-whisper is the fallback
+            try:
+                from faster_whisper import WhisperModel
+                backend = "faster-whisper"
+                # INT8 on CPU and FP16 on GPU, both with CTranslate2's fused kernels
+                compute_type = "int8" if self.device == "cpu" else "float16"
+            except ImportError:
+                WhisperModel = None
+                backend = "openai-whisper"
+                compute_type = "float16" if self.device == "cuda" else "float32"
+
+            # Weights already loaded in this process are reused instead of read again
+            cache_key = (backend, self.model_id, self.device, compute_type)
+            if cache_key not in _MODEL_CACHE:
+                model, batched_model = self._load_model(backend, compute_type, WhisperModel)
+                # openai-whisper keeps kv-cache and word-timing hooks on the model itself,
+                # so concurrent decodes on one model must take turns
+                _MODEL_CACHE[cache_key] = (model, batched_model, threading.Lock())
+            else:
+                print(f"Reusing loaded Whisper {self.model_id} model")
+
+            self.backend = backend
+            self.model, self.batched_model, self._model_lock = _MODEL_CACHE[cache_key]
+
+    def _load_model(self, backend, compute_type, WhisperModel):
+        """Load the Whisper model (and batched pipeline on GPU) for a backend"""
+        batched_model = None
+
+        if backend == "faster-whisper":
+            print(f"Loading faster-whisper {self.model_id} model ({compute_type})...")
+            # CTranslate2 otherwise caps CPU inference at 4 threads; the cores are split between
+            # the workers, each of which can run one transcription concurrently on the same weights
+            cpu_threads = max(1, (os.cpu_count() or 4) // WHISPER_NUM_WORKERS)
+            model = WhisperModel(
+                self.model_id,
+                device=self.device,
+                compute_type=compute_type,
+                cpu_threads=int(os.environ.get("WHISPER_CPU_THREADS", cpu_threads)),
+                num_workers=WHISPER_NUM_WORKERS
+            )
+
+            # On GPU, decode the VAD chunks of long files in parallel batches.
+            # Sequential 30s windows leave most of the GPU idle.
+            if self.device == "cuda":
+                try:
+                    from faster_whisper import BatchedInferencePipeline
+                    batched_model = BatchedInferencePipeline(model=model)
+                    print(f"Batched decoding enabled (batch_size={self.batch_size})")
+                except ImportError:
+                    print("BatchedInferencePipeline not available, decoding sequentially")
+        else:
+            import whisper
+            print(f"Loading Whisper {self.model_id} model for better accuracy and timing...")
+            model = whisper.load_model(self.model_id, device=self.device)
+
+            if self.device == "cuda" and os.environ.get("WHISPER_COMPILE", "1") == "1":
+                self._compile_model(model)
+
+        print("Whisper model loaded successfully")
+        return model, batched_model
+
+    def _compile_model(self, model):
+        """Compile the openai-whisper encoder with torch.compile and pay the compile cost up front"""
+        encoder = model.encoder
+        try:
+            import torch
+
+            # The encoder always sees fixed 30s mel windows, so CUDA graphs fit it well;
+            # the decoder's kv-cache hooks and growing shapes are left to eager mode
+            torch._dynamo.config.cache_size_limit = 64
+            model.encoder = torch.compile(model.encoder, mode="reduce-overhead", fullgraph=False)
+
+            # Warm up under inference_mode, as transcriptions run, so the compiled graph is reused
+            print("Warming up compiled Whisper encoder...")
+            with torch.inference_mode():
+                model.transcribe(np.zeros(16000, dtype=np.float32), fp16=True)
+            print("Compiled Whisper encoder ready")
+        except Exception as e:
+            # Older torch (no torch.compile) or a backend that fails to compile: stay eager
+            print(f"torch.compile not available, using eager Whisper: {e}")
+            model.encoder = encoder
+
+    def _run_model(self, audio_data, language_param, word_timestamps):
+        """Run the loaded backend and return a result shaped like openai-whisper's"""
+        if self.backend == "faster-whisper":
+            if self.batched_model is not None:
+                segments_iter, info = self.batched_model.transcribe(
+                    audio_data,
+                    language=language_param,
+                    word_timestamps=word_timestamps,
+                    beam_size=1,
+                    vad_filter=True,
+                    batch_size=self.batch_size
+                )
+            else:
+                segments_iter, info = self.model.transcribe(
+                    audio_data,
+                    language=language_param,
+                    word_timestamps=word_timestamps,
+                    beam_size=1,
+                    vad_filter=True
+                )
+
+            segments = []
+            for segment in segments_iter:
+                segments.append({
+                    "start": segment.start,
+                    "end": segment.end,
+                    "text": segment.text,
+                    "avg_logprob": segment.avg_logprob,
+                    "words": [
+                        {"word": word.word, "start": word.start, "end": word.end}
+                        for word in (segment.words or [])
+                    ]
+                })
+
+            return {"segments": segments, "language": info.language}
+
+        import torch
+
+        # Copy the audio to the GPU once: openai-whisper then computes the log-mel there
+        # and no 30s mel window has to travel host->device on its own
+        audio_input = audio_data
+        if self.device == "cuda":
+            audio_input = torch.from_numpy(audio_data).to(self.device, non_blocking=True)
+
+        # faster-whisper runs Silero VAD itself; for openai-whisper only decode the speech regions
+        regions = self._speech_regions(audio_data)
+        if regions is None:
+            return self._transcribe_openai(audio_input, language_param, word_timestamps)
+
+        print(f"VAD kept {len(regions)} speech windows")
+        segments = []
+        language = language_param
+        for start, end in regions:
+            offset = start / 16000
+            result = self._transcribe_openai(audio_input[start:end], language, word_timestamps)
+            # Reuse the language detected in the first window instead of detecting it again
+            language = language or result.get('language')
+
+            for segment in result['segments']:
+                segment['start'] += offset
+                segment['end'] += offset
+                for word in segment.get('words') or []:
+                    word['start'] += offset
+                    word['end'] += offset
+                segments.append(segment)
+
+        return {"segments": segments, "language": language or 'unknown'}
+
+    def _speech_regions(self, audio_data):
+        """Find speech with Silero VAD, packed into windows of up to 30s (sample ranges)"""
+        try:
+            import torch
+            from silero_vad import load_silero_vad, get_speech_timestamps
+        except ImportError:
+            return None
+
+        with self._vad_lock:
+            if self.vad_model is None:
+                self.vad_model = load_silero_vad()
+
+            timestamps = get_speech_timestamps(torch.from_numpy(audio_data), self.vad_model, sampling_rate=16000)
+
+        # Whisper pads every call to 30s, so merge neighbouring speech up to that length
+        regions = []
+        for timestamp in timestamps:
+            if regions and timestamp['end'] - regions[-1][0] <= 30 * 16000:
+                regions[-1][1] = timestamp['end']
+            else:
+                regions.append([timestamp['start'], timestamp['end']])
+
+        return regions
+
+    def _transcribe_openai(self, audio_data, language_param, word_timestamps):
+        """Run openai-whisper on an audio array"""
+        import torch
+
+        # No autograd bookkeeping at all (no version counters or view tracking), not just no_grad
+        with self._model_lock, torch.inference_mode():
+            if not word_timestamps:
+                return self.model.transcribe(
+                    audio_data,
+                    language=language_param,
+                    word_timestamps=False,
+                    fp16=self._fp16
+                )
+
+            return self.model.transcribe(audio_data, language=language_param, **self._whisper_kwargs)
+
+    def _resample(self, audio_data, sample_rate):
+        """Resample mono audio to 16kHz with soxr, falling back to scipy's polyphase filter"""
+        try:
+            import soxr
+            return soxr.resample(audio_data, sample_rate, 16000, quality='QQ')
+        except ImportError:
+            from scipy.signal import resample_poly
+            return resample_poly(audio_data, 16000, sample_rate).astype(np.float32, copy=False)
+
+    def _read_audio_stream(self, sf, audio_path):
+        """Read audio in 30s blocks, downmixing and resampling each block to 16kHz mono.
+        Only the 16kHz mono result is ever held in memory, never the full-rate multichannel file."""
+        sample_rate = sf.info(audio_path).samplerate
+
+        resampler = None
+        if sample_rate != 16000:
+            try:
+                import soxr
+                resampler = soxr.ResampleStream(sample_rate, 16000, 1, dtype='float32', quality='QQ')
+            except ImportError:
+                # scipy's polyphase resampler needs the whole signal at once
+                print(f"Resampling from {sample_rate}Hz to 16000Hz")
+                audio_data, sample_rate = sf.read(audio_path, dtype='float32', always_2d=True)
+                audio_data = audio_data.mean(axis=1, dtype=np.float32)
+                return self._resample(audio_data, sample_rate), sample_rate
+
+        chunks = []
+        for block in sf.blocks(audio_path, blocksize=sample_rate * 30, dtype='float32', always_2d=True):
+            # Downmix in float32; a single channel is just a view
+            mono = block[:, 0] if block.shape[1] == 1 else block.mean(axis=1, dtype=np.float32)
+            if resampler is not None:
+                mono = resampler.resample_chunk(mono)
+            chunks.append(mono)
+
+        if resampler is not None:
+            # Flush the samples still held in the resampler's filter
+            chunks.append(resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True))
+
+        if not chunks:
+            return np.zeros(0, dtype=np.float32), sample_rate
+        return np.concatenate(chunks), sample_rate
 
     def _load_audio_with_soundfile(self, audio_path):
         """Load audio using soundfile - no FFmpeg dependency required"""
         try:
             import soundfile as sf
-            import librosa
             print(f"Loading audio with soundfile: {audio_path}")
 
             # Validate file exists and has content
@@ -38,24 +358,15 @@ class Transcriber:
             print(f"Audio file size: {file_size} bytes")
 
             try:
-                # Load audio with soundfile
-                audio_data, sample_rate = sf.read(audio_path, dtype='float32')
-                print(f"Audio loaded: sample_rate={sample_rate}Hz, channels={audio_data.ndim}, shape={audio_data.shape}")
-
-                # Convert to mono if stereo
-                if audio_data.ndim > 1:
-                    print("Converting stereo to mono")
-                    audio_data = np.mean(audio_data, axis=1)
-
-                # Resample to 16kHz for Whisper if needed
-                if sample_rate != 16000:
-                    print(f"Resampling from {sample_rate}Hz to 16000Hz")
-                    audio_data = librosa.resample(audio_data, orig_sr=sample_rate, target_sr=16000)
-
-                # Ensure audio is in proper range [-1, 1]
-                if audio_data.max() > 1.0 or audio_data.min() < -1.0:
+                # Load audio with soundfile, already downmixed and resampled to 16kHz mono
+                audio_data, sample_rate = self._read_audio_stream(sf, audio_path)
+                print(f"Audio loaded: sample_rate={sample_rate}Hz, converted to 16000Hz mono, shape={audio_data.shape}")
+
+                # Ensure audio is in proper range [-1, 1], scaling in place
+                peak = np.abs(audio_data).max() if audio_data.size else 0.0
+                if peak > 1.0:
                     print("Normalizing audio to [-1, 1] range")
-                    audio_data = audio_data / np.max(np.abs(audio_data))
+                    np.multiply(audio_data, 1.0 / peak, out=audio_data)
 
                 duration = len(audio_data) / 16000
                 print(f"Audio processed successfully: duration={duration:.2f}s, shape={audio_data.shape}, range=[{audio_data.min():.3f}, {audio_data.max():.3f}]")
@@ -69,6 +380,7 @@ class Transcriber:
                 print(f"Soundfile failed: {sf_error}")
                 # Fallback to librosa
                 try:
+                    import librosa
                     print("Trying with librosa as fallback...")
                     audio_data, sample_rate = librosa.load(audio_path, sr=16000, mono=True)
                     duration = len(audio_data) / 16000
@@ -86,9 +398,6 @@ class Transcriber:
     def transcribe(self, audio_path, source_language="auto"):
         """Transcribe audio file to text with word-level timestamps for better sync"""
         try:
-            # Ensure model is loaded
-            self._ensure_model_loaded()
-
             if not os.path.exists(audio_path):
                 raise Exception(f"Audio file not found: {audio_path}")
 
@@ -102,124 +411,148 @@ class Transcriber:
             if not os.path.isfile(audio_path):
                 raise Exception(f"Audio file does not exist: {audio_path}")
 
-            # Load audio manually to avoid FFmpeg dependency issues
+            # Load audio manually to avoid FFmpeg dependency issues.
+            # Decoding/resampling is CPU work, so it runs while the model is loaded onto the device.
             print("Loading audio with soundfile for Whisper compatibility...")
-            audio_data = self._load_audio_with_soundfile(audio_path)
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                audio_future = executor.submit(self._load_audio_with_soundfile, audio_path)
+
+                # Ensure model is loaded
+                self._ensure_model_loaded()
+
+                audio_data = audio_future.result()
             if audio_data is None:
                 raise Exception("Could not load audio file")
 
-            print("Starting transcription with loaded audio data...")
+            return self._transcribe_audio(audio_data, language_param)
 
-            try:
-                # Transcribe with word timestamps using audio array
-                result = self.model.transcribe(
-                    audio_data,
-                    language=language_param,
-                    word_timestamps=True,
-                    temperature=0.0,
-                    best_of=1,
-                    beam_size=1,
-                    patience=1.0,
-                    length_penalty=1.0,
-                    suppress_tokens="-1",
-                    initial_prompt=None,
-                    condition_on_previous_text=True,
-                    fp16=torch.cuda.is_available(),
-                    compression_ratio_threshold=2.4,
-                    logprob_threshold=-1.0,
-                    no_speech_threshold=0.6
-                )
-                print("Transcription with word timestamps successful")
-            except Exception as transcribe_error:
-                print(f"Error during word-level transcription: {transcribe_error}")
-                # Fallback to basic transcription without word timestamps
-                print("Falling back to basic transcription without word timestamps...")
-                try:
-                    result = self.model.transcribe(
-                        audio_data,
-                        language=language_param,
-                        word_timestamps=False
-                    )
-                    print("Basic transcription successful")
-                except Exception as basic_error:
-                    print(f"Error during basic transcription: {basic_error}")
-                    raise Exception(f"Both word-level and basic transcription failed: {basic_error}")
+        except Exception as e:
+            raise Exception(f"Error transcribing audio: {str(e)}")
 
-            segments = []
+    def transcribe_files(self, audio_paths, source_language="auto", num_workers=None):
+        """Transcribe several audio files with the one loaded model, in parallel where the backend allows.
+        Returns the segment lists in the order of audio_paths."""
+        self._ensure_model_loaded()
 
-            # Process each segment from Whisper result
-            for segment in result['segments']:
-                # If word-level timestamps are available, use them for better accuracy
-                if 'words' in segment and segment['words']:
-                    # Group words into phrases for better readability
-                    current_phrase = []
-                    phrase_start = None
-
-                    for word_info in segment['words']:
-                        word_text = word_info.get('word', '').strip()
-                        word_start = word_info.get('start', 0)
-                        word_end = word_info.get('end', 0)
-
-                        if not word_text:
-                            continue
-
-                        if phrase_start is None:
-                            phrase_start = word_start
-
-                        current_phrase.append(word_text)
-
-                        # End phrase on punctuation or when reaching optimal length
-                        phrase_text = ' '.join(current_phrase)
-                        should_end_phrase = (
-                            word_text.endswith(('.', '!', '?', ',', ';')) or
-                            len(phrase_text) > 50 or
-                            len(current_phrase) >= 8
-                        )
-
-                        if should_end_phrase and current_phrase:
-                            segments.append({
-                                "start": phrase_start,
-                                "end": word_end,
-                                "text": phrase_text.strip(),
-                                "language": result.get('language', 'unknown'),
-                                "confidence": segment.get('avg_logprob', 0.0)
-                            })
-
-                            current_phrase = []
-                            phrase_start = None
-
-                    # Add remaining words as final phrase
-                    if current_phrase and phrase_start is not None:
-                        final_phrase = ' '.join(current_phrase)
-                        # Use the last word's end time or segment end time
-                        final_end = segment['words'][-1].get('end', segment['end'])
+        # CTranslate2 runs concurrent calls on its workers over shared weights. openai-whisper
+        # files go one at a time: the (compiled) PyTorch model is not safe to share across threads.
+        if self.backend == "faster-whisper":
+            num_workers = num_workers or WHISPER_NUM_WORKERS
+        else:
+            num_workers = 1
+        print(f"Transcribing {len(audio_paths)} files with {num_workers} worker(s)")
 
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            return list(executor.map(lambda audio_path: self.transcribe(audio_path, source_language), audio_paths))
+
+    def transcribe_array(self, audio_data, source_language="auto"):
+        """Transcribe 16kHz mono float32 samples that are already in memory (no audio file involved)"""
+        try:
+            print(f"Transcribing {len(audio_data) / 16000:.2f}s of audio")
+            print(f"Source language: {source_language}")
+
+            if len(audio_data) < 1600:
+                raise Exception(f"Audio too short: {len(audio_data) / 16000:.2f}s")
+
+            self._ensure_model_loaded()
+
+            language_param = None if source_language == "auto" else source_language
+            return self._transcribe_audio(audio_data, language_param)
+
+        except Exception as e:
+            raise Exception(f"Error transcribing audio: {str(e)}")
+
+    def _transcribe_audio(self, audio_data, language_param):
+        """Run Whisper on a loaded audio array and group the words into subtitle phrases"""
+        print("Starting transcription with loaded audio data...")
+
+        try:
+            # Transcribe with word timestamps using audio array
+            result = self._run_model(audio_data, language_param, word_timestamps=True)
+            print("Transcription with word timestamps successful")
+        except Exception as transcribe_error:
+            print(f"Error during word-level transcription: {transcribe_error}")
+            # Fallback to basic transcription without word timestamps
+            print("Falling back to basic transcription without word timestamps...")
+            try:
+                result = self._run_model(audio_data, language_param, word_timestamps=False)
+                print("Basic transcription successful")
+            except Exception as basic_error:
+                print(f"Error during basic transcription: {basic_error}")
+                raise Exception(f"Both word-level and basic transcription failed: {basic_error}")
+
+        segments = []
+
+        # Process each segment from Whisper result
+        for segment in result['segments']:
+            # If word-level timestamps are available, use them for better accuracy
+            if 'words' in segment and segment['words']:
+                # Group words into phrases for better readability
+                current_phrase = []
+                phrase_start = None
+
+                for word_info in segment['words']:
+                    word_text = word_info.get('word', '').strip()
+                    word_start = word_info.get('start', 0)
+                    word_end = word_info.get('end', 0)
+
+                    if not word_text:
+                        continue
+
+                    if phrase_start is None:
+                        phrase_start = word_start
+
+                    current_phrase.append(word_text)
+
+                    # End phrase on punctuation or when reaching optimal length
+                    phrase_text = ' '.join(current_phrase)
+                    should_end_phrase = (
+                        word_text.endswith(('.', '!', '?', ',', ';')) or
+                        len(phrase_text) > 50 or
+                        len(current_phrase) >= 8
+                    )
+
+                    if should_end_phrase and current_phrase:
                         segments.append({
                             "start": phrase_start,
-                            "end": final_end,
-                            "text": final_phrase.strip(),
+                            "end": word_end,
+                            "text": phrase_text.strip(),
                             "language": result.get('language', 'unknown'),
                             "confidence": segment.get('avg_logprob', 0.0)
                         })
-                else:
-                    # Fallback to segment-level timestamps if word-level not available
+
+                        current_phrase = []
+                        phrase_start = None
+
+                # Add remaining words as final phrase
+                if current_phrase and phrase_start is not None:
+                    final_phrase = ' '.join(current_phrase)
+                    # Use the last word's end time or segment end time
+                    final_end = segment['words'][-1].get('end', segment['end'])
+
                     segments.append({
-                        "start": segment['start'],
-                        "end": segment['end'],
-                        "text": segment['text'].strip(),
+                        "start": phrase_start,
+                        "end": final_end,
+                        "text": final_phrase.strip(),
                         "language": result.get('language', 'unknown'),
                         "confidence": segment.get('avg_logprob', 0.0)
                     })
+            else:
+                # Fallback to segment-level timestamps if word-level not available
+                segments.append({
+                    "start": segment['start'],
+                    "end": segment['end'],
+                    "text": segment['text'].strip(),
+                    "language": result.get('language', 'unknown'),
+                    "confidence": segment.get('avg_logprob', 0.0)
+                })
 
-            print(f"Transcription completed. Found {len(segments)} segments with precise timing")
+        print(f"Transcription completed. Found {len(segments)} segments with precise timing")
 
-            # Sort segments by start time to ensure proper order
-            segments.sort(key=lambda x: x['start'])
+        # Sort segments by start time to ensure proper order
+        segments.sort(key=lambda x: x['start'])
 
-            return segments
-
-        except Exception as e:
-            raise Exception(f"Error transcribing audio: {str(e)}")
+        return segments
 
     def get_supported_languages(self):
         """Get list of supported languages"""
@@ -248,4 +581,9 @@ class Transcriber:
             "da": "Danish",
             "no": "Norwegian",
             "fi": "Finnish"
-        }
\ No newline at end of file
+        }
+
+def get_transcriber(source_language="auto"):
+    """Process-wide Transcriber: the Whisper weights stay on the device between requests.
+    English sources get the English-only model where the default checkpoint has one."""
+    return Transcriber.get_shared(english_only=source_language == "en")
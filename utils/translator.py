@@ -1,14 +1,109 @@
+import os
 import time
 import re
+import threading
 import requests
 import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+# Segments are sent to MyMemory as newline-joined batches of at most this many lines
+MAX_BATCH = int(os.environ.get('TRANSLATE_MAX_BATCH', '50'))
+
+# MyMemory rejects queries longer than 500 bytes
+MAX_QUERY_BYTES = 500
+
+# Number of translation requests in flight at once
+TRANSLATE_WORKERS = int(os.environ.get('TRANSLATE_WORKERS', '8'))
+
+# Requests per second sent to MyMemory across all workers
+TRANSLATE_RATE = float(os.environ.get('TRANSLATE_RATE', '10'))
+
+# Patterns used by Translator._clean_text, compiled once for every segment
+_WHITESPACE_RE = re.compile(r'\s+')
+_BRACKETED_RE = re.compile(r'\[.*?\]')
+_PARENTHETICAL_RE = re.compile(r'\(.*?\)')
+_REPEATED_PUNCTUATION_RE = re.compile(r'([.!?])\1+')
+
+# Translations kept in memory, so repeated lines (fillers, short replies) skip the API
+TRANSLATION_CACHE_SIZE = 4096
+
+# Least recently used entries are evicted first: {(text, source_lang, target_lang): translation}
+_translation_cache = OrderedDict()
+_translation_cache_lock = threading.Lock()
+
+def _get_cached_translation(text, source_lang, target_lang):
+    """Return a previously fetched translation, or None"""
+    key = (text, source_lang, target_lang)
+    with _translation_cache_lock:
+        translated = _translation_cache.get(key)
+        if translated is not None:
+            _translation_cache.move_to_end(key)
+        return translated
+
+def _cache_translation(text, source_lang, target_lang, translated):
+    """Remember a successful translation, evicting the oldest entry when full"""
+    with _translation_cache_lock:
+        _translation_cache[(text, source_lang, target_lang)] = translated
+        _translation_cache.move_to_end((text, source_lang, target_lang))
+        if len(_translation_cache) > TRANSLATION_CACHE_SIZE:
+            _translation_cache.popitem(last=False)
+
+class RateLimiter:
+    """Token bucket shared by the worker threads: bursts up to capacity, then rate requests per second"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
 
 class Translator:
     def __init__(self):
-        # Use MyMemory API for translation
+        # Use MyMemory translation API for translation
         self.translation_api_available = True
+
+        # One keep-alive connection pool for every worker thread, instead of a new TLS handshake per request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(16, TRANSLATE_WORKERS))
+        self.session.mount('https://', adapter)
+        self.rate_limiter = RateLimiter(TRANSLATE_RATE, capacity=TRANSLATE_WORKERS)
         print("Using MyMemory translation API")
 
+    def _request_mymemory(self, text, source_lang, target_lang):
+        """Call the MyMemory API and return the translated text, or None on failure"""
+        url = "https://api.mymemory.translated.net/get"
+        params = {
+            'q': text,
+            'langpair': f'{source_lang}|{target_lang}'
+        }
+
+        self.rate_limiter.acquire()
+        response = self.session.get(url, params=params, timeout=10)
+        if response.status_code == 200:
+            data = response.json()
+            if data['responseStatus'] == 200:
+                return data['responseData']['translatedText']
+
+        return None
+
     def _translate_with_mymemory(self, text, source_lang="id", target_lang="en"):
         """Use MyMemory translation API"""
         try:
@@ -16,27 +111,65 @@ class Translator:
             if not text or len(text) < 3:
                 return text
 
-            url = "https://api.mymemory.translated.net/get"
-            params = {
-                'q': text,
-                'langpair': f'{source_lang}|{target_lang}'
-            }
+            translated = _get_cached_translation(text, source_lang, target_lang)
+            if translated is not None:
+                return translated
 
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data['responseStatus'] == 200:
-                    return data['responseData']['translatedText']
+            translated = self._request_mymemory(text, source_lang, target_lang)
+            if translated is not None:
+                _cache_translation(text, source_lang, target_lang, translated)
+                return translated
 
             return f"[Translation: {text}]"
         except Exception as e:
             print(f"Translation error: {e}")
             return f"[Translation: {text}]"
 
+    def _translate_batch(self, texts, source_lang, target_lang):
+        """Translate several lines in one request, falling back to one request per line"""
+        if len(texts) > 1:
+            try:
+                translated = self._request_mymemory('\n'.join(texts), source_lang, target_lang)
+                lines = translated.split('\n') if translated else []
+                # Only trust the batch if every line came back
+                if len(lines) == len(texts):
+                    lines = [line.strip() for line in lines]
+                    for text, line in zip(texts, lines):
+                        _cache_translation(text, source_lang, target_lang, line)
+                    return lines
+                print(f"Batch translation returned {len(lines)} of {len(texts)} lines, translating one by one")
+            except Exception as e:
+                print(f"Batch translation error: {e}")
+
+        return [self._translate_with_mymemory(text, source_lang, target_lang) for text in texts]
+
+    def _make_batches(self, texts):
+        """Group texts into batches that fit MyMemory's query limits"""
+        batches = []
+        current = []
+        current_bytes = 0
+
+        for text in texts:
+            text_bytes = len(text.encode('utf-8')) + 1  # newline separator
+            if current and (len(current) >= MAX_BATCH or current_bytes + text_bytes > MAX_QUERY_BYTES):
+                batches.append(current)
+                current = []
+                current_bytes = 0
+            current.append(text)
+            current_bytes += text_bytes
+
+        if current:
+            batches.append(current)
+
+        return batches
+
     def translate_segments(self, segments, target_language='en'):
         """Translate segments to target language"""
         translated_segments = []
 
+        # Texts still to translate, grouped by source language: {source_lang: [(output_index, text)]}
+        pending = {}
+
         for segment in segments:
             try:
                 # Skip if already in target language
@@ -55,24 +188,17 @@ class Translator:
                 if not text.strip():
                     continue
 
-                # Translate to target language using MyMemory API
-                source_lang = segment.get('language', 'id')
-                if source_lang == target_language:
-                    # Already in target language
-                    translated_text = text
-                else:
-                    # Translate from source language to target language
-                    translated_text = self._translate_with_mymemory(text, source_lang, target_language)
-
                 translated_segments.append({
                     'start': segment['start'],
                     'end': segment['end'],
-                    'text': translated_text,
+                    'text': text,
                     'original_text': segment['text']
                 })
 
-                # Small delay to avoid rate limiting
-                time.sleep(0.1)
+                # Translate to target language using MyMemory API
+                source_lang = segment.get('language', 'id')
+                if source_lang != target_language:
+                    pending.setdefault(source_lang, []).append((len(translated_segments) - 1, text))
 
             except Exception as e:
                 print(f"Translation error for segment: {str(e)}")
@@ -84,21 +210,55 @@ class Translator:
                     'original_text': segment['text']
                 })
 
+        # Each job is one batch request: (output indices per text, texts, source language)
+        jobs = []
+        for source_lang, items in pending.items():
+            # Very short texts are kept as-is; identical texts are sent once and shared
+            unique = {}
+            for index, text in items:
+                if len(text) >= 3:
+                    unique.setdefault(text, []).append(index)
+
+            # Texts translated before (by this or an earlier video) are filled in without a request
+            texts = []
+            for text, indices in unique.items():
+                translated = _get_cached_translation(text, source_lang, target_language)
+                if translated is None:
+                    texts.append(text)
+                    continue
+                for index in indices:
+                    translated_segments[index]['text'] = translated
+
+            for batch in self._make_batches(texts):
+                jobs.append(([unique[text] for text in batch], batch, source_lang))
+
+        # Batches are independent, so overlap their network round trips
+        with ThreadPoolExecutor(max_workers=TRANSLATE_WORKERS) as executor:
+            results = executor.map(lambda job: self._translate_job(job, target_language), jobs)
+            for index_groups, translated_texts in results:
+                for indices, translated_text in zip(index_groups, translated_texts):
+                    for index in indices:
+                        translated_segments[index]['text'] = translated_text
+
         return translated_segments
 
+    def _translate_job(self, job, target_language):
+        """Translate one batch on a worker thread"""
+        index_groups, batch, source_lang = job
+        # Pacing is left to the shared rate limiter in _request_mymemory
+        return index_groups, self._translate_batch(batch, source_lang, target_language)
+
     def _clean_text(self, text):
         """Clean text for better translation"""
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
 
         # Remove common speech artifacts
-        text = re.sub(r'\[.*?\]', '', text)  # Remove bracketed content
-        text = re.sub(r'\(.*?\)', '', text)  # Remove parenthetical content
+        text = _BRACKETED_RE.sub('', text)  # Remove bracketed content
+        text = _PARENTHETICAL_RE.sub('', text)  # Remove parenthetical content
 
-        # Remove repeated punctuation
-        text = re.sub(r'[.]{2,}', '.', text)
-        text = re.sub(r'[!]{2,}', '!', text)
-        text = re.sub(r'[?]{2,}', '?', text)
+        # Remove repeated punctuation ("..." -> ".", "!!" -> "!", "??" -> "?") in one pass
+        text = _REPEATED_PUNCTUATION_RE.sub(r'\1', text)
 
         return text.strip()
 
@@ -120,4 +280,15 @@ class Translator:
             detection = self.google_translator.detect(text)
             return detection.lang
         except Exception as e:
-            return 'unknown'
\ No newline at end of file
+            return 'unknown'
+
+_shared_translator = None
+_shared_translator_lock = threading.Lock()
+
+def get_translator():
+    """Process-wide Translator, so every request reuses one pooled HTTP session"""
+    global _shared_translator
+    with _shared_translator_lock:
+        if _shared_translator is None:
+            _shared_translator = Translator()
+        return _shared_translator
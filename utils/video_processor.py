@@ -1,7 +1,10 @@
 import os
-import moviepy.editor as mp
-from moviepy.video.tools.subtitles import SubtitlesClip
-import tempfile
+import json
+import shutil
+import subprocess
+from fractions import Fraction
+import numpy as np
+from utils import PROCESSED_DIR
 
 class VideoProcessor:
     def __init__(self):
@@ -9,6 +12,31 @@ class VideoProcessor:
         self.temp_dir = os.path.join(os.getcwd(), 'temp')
         os.makedirs(self.temp_dir, exist_ok=True)
 
+        # Optional ffmpeg hardware decoder for the subtitle pass, e.g. "cuda" for NVDEC
+        self.hwaccel = os.environ.get('FFMPEG_HWACCEL')
+
+        # "sidecar" ships the untouched video with the SRT next to it (no re-encode);
+        # "hardburn" renders the subtitles into the video with a libx264 pass
+        self.subtitle_mode = os.environ.get('SUBTITLE_MODE', 'sidecar')
+
+        # Outcome of the last add_subtitles call: whether the subtitles ended up in the video itself
+        self.subtitles_burned = False
+
+    def prefetch(self, video_path):
+        """Ask the kernel to start reading the video into the page cache before ffmpeg needs it"""
+        if not hasattr(os, 'posix_fadvise'):
+            return
+
+        try:
+            fd = os.open(video_path, os.O_RDONLY)
+            try:
+                # Asynchronous readahead; the audio and subtitle passes then read from memory
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            print(f"Could not prefetch video: {e}")
+
     def extract_audio(self, video_path):
         """Extract audio from video file and save as WAV"""
         try:
@@ -18,31 +46,31 @@ class VideoProcessor:
             if not os.path.isfile(video_path):
                 raise Exception(f"Video file not found: {video_path}")
 
-            video = mp.VideoFileClip(video_path)
-
             # Create temporary audio file with absolute path
             audio_filename = f"audio_{os.path.basename(video_path).split('.')[0]}.wav"
             audio_path = os.path.abspath(os.path.join(self.temp_dir, audio_filename))
 
             print(f"Extracting audio to: {audio_path}")
 
-            # Extract and save audio with specific parameters for Whisper compatibility
-            audio = video.audio
-            if audio is None:
-                raise Exception("No audio track found in video")
-
-            # Save audio with settings compatible with Whisper
-            audio.write_audiofile(
-                audio_path,
-                verbose=False,
-                logger=None,
-                codec='pcm_s16le',  # 16-bit PCM for better compatibility
-                ffmpeg_params=['-ar', '16000']  # 16kHz sample rate for Whisper
-            )
-
-            # Close video and audio clips
-            audio.close()
-            video.close()
+            # ffmpeg demuxes only the audio stream: 16 kHz mono 16-bit PCM, as Whisper expects
+            command = [
+                'ffmpeg', '-y', '-nostdin', '-loglevel', 'error',
+                '-i', video_path,
+                '-vn', '-ac', '1', '-ar', '16000',
+                '-acodec', 'pcm_s16le', '-f', 'wav',
+                audio_path
+            ]
+
+            try:
+                result = subprocess.run(command, capture_output=True, text=True)
+            except FileNotFoundError:
+                raise Exception("ffmpeg executable not found")
+
+            if result.returncode != 0:
+                error = result.stderr.strip()
+                if 'does not contain any stream' in error or 'matches no streams' in error:
+                    raise Exception("No audio track found in video")
+                raise Exception(f"ffmpeg failed: {error}")
 
             # Verify the audio file was created successfully
             if not os.path.exists(audio_path):
@@ -57,47 +85,163 @@ class VideoProcessor:
         except Exception as e:
             raise Exception(f"Error extracting audio: {str(e)}")
 
-    def add_subtitles(self, video_path, srt_path, task_id):
-        """Add subtitles to video and save the result - using alternative method without ImageMagick"""
+    def extract_audio_array(self, video_path):
+        """Decode the audio track straight into a 16kHz mono float32 array, without a WAV file"""
+        try:
+            print(f"Loading video: {video_path}")
+
+            if not os.path.isfile(video_path):
+                raise Exception(f"Video file not found: {video_path}")
+
+            # ffmpeg writes raw little-endian float32 samples to stdout, the format Whisper consumes
+            command = [
+                'ffmpeg', '-nostdin', '-loglevel', 'error',
+                '-i', video_path,
+                '-vn', '-ac', '1', '-ar', '16000',
+                '-f', 'f32le', '-'
+            ]
+
+            try:
+                process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            except FileNotFoundError:
+                raise Exception("ffmpeg executable not found")
+
+            # communicate() drains stderr alongside stdout, so a chatty ffmpeg cannot block on it
+            raw_audio, error = process.communicate()
+            if process.returncode != 0:
+                error = error.decode('utf-8', errors='replace').strip()
+                if 'does not contain any stream' in error or 'matches no streams' in error:
+                    raise Exception("No audio track found in video")
+                raise Exception(f"ffmpeg failed: {error}")
+
+            # frombuffer over bytes is read-only, and torch.from_numpy warns on non-writable arrays
+            audio_data = np.frombuffer(bytearray(raw_audio), dtype=np.float32)
+            if audio_data.size == 0:
+                raise Exception("Audio extraction failed - no samples decoded")
+
+            print(f"Audio extracted successfully: duration={audio_data.size / 16000:.2f}s, shape={audio_data.shape}")
+            return audio_data
+
+        except Exception as e:
+            raise Exception(f"Error extracting audio: {str(e)}")
+
+    def add_subtitles(self, video_path, srt_path, task_id, mode=None):
+        """Burn subtitles into the video with a single ffmpeg pass (mode="hardburn") or deliver
+        the untouched video with the SRT file alongside (mode="sidecar").
+        Sets self.subtitles_burned to report which of the two the output is."""
         try:
+            self.subtitles_burned = False
+            mode = mode or self.subtitle_mode
+            if mode not in ('hardburn', 'sidecar'):
+                raise Exception(f"Unknown subtitle mode: {mode}")
+
             print(f"Adding subtitles to video: {video_path}")
             print(f"Using subtitle file: {srt_path}")
 
-            # For now, let's just copy the original video and provide the SRT file separately
-            # This avoids the ImageMagick dependency while still providing subtitles
-
             # Output paths
             output_filename = f"translated_{task_id}.mp4"
-            output_path = os.path.join('static/processed', output_filename)
+            output_path = os.path.join(PROCESSED_DIR, output_filename)
 
             srt_output_filename = f"translated_{task_id}.srt"
-            srt_output_path = os.path.join('static/processed', srt_output_filename)
-
-            # Copy original video
-            import shutil
-            shutil.copy2(video_path, output_path)
+            srt_output_path = os.path.join(PROCESSED_DIR, srt_output_filename)
 
             # Copy subtitle file to output location
             shutil.copy2(srt_path, srt_output_path)
-
-            print(f"Video copied to: {output_path}")
             print(f"Subtitle file copied to: {srt_output_path}")
-            print("Note: Subtitles are provided as separate SRT file. Use VLC Player or any video player that supports SRT files.")
+
+            if mode == 'sidecar':
+                self._link_or_copy(video_path, output_path)
+                print(f"Video saved to: {output_path}, subtitles in {srt_output_path}")
+                return output_path
+
+            # Decode, render subtitles and encode in one process; audio is passed through untouched
+            command = ['ffmpeg', '-y', '-nostdin', '-loglevel', 'error']
+            if self.hwaccel:
+                command += ['-hwaccel', self.hwaccel]
+            command += [
+                '-i', video_path,
+                '-vf', f"subtitles={self._escape_filter_path(srt_output_path)}",
+                '-c:v', 'libx264', '-preset', 'veryfast', '-crf', '23',
+                '-c:a', 'copy',
+                output_path
+            ]
+
+            try:
+                result = subprocess.run(command, capture_output=True, text=True)
+                burn_error = result.stderr.strip() if result.returncode != 0 else None
+            except FileNotFoundError:
+                burn_error = "ffmpeg executable not found"
+
+            if burn_error is None:
+                self.subtitles_burned = True
+                print(f"Video with burned-in subtitles saved to: {output_path}")
+            else:
+                # Still deliver the original video; the SRT file carries the subtitles
+                print(f"ffmpeg could not burn subtitles: {burn_error}")
+                self._link_or_copy(video_path, output_path)
+                print(f"Video copied to: {output_path}")
+                print("Note: Subtitles are provided as separate SRT file. Use VLC Player or any video player that supports SRT files.")
 
             return output_path
         except Exception as e:
             raise Exception(f"Error processing video: {str(e)}")
 
+    def _link_or_copy(self, src, dst):
+        """Hard-link dst to src so no bytes are duplicated, copying when the filesystem can't link"""
+        if os.path.exists(dst):
+            os.remove(dst)
+        try:
+            os.link(src, dst)
+        except OSError:
+            # Different filesystem (EXDEV) or no hard link support
+            shutil.copy2(src, dst)
+
+    def _escape_filter_path(self, path):
+        """Quote a file path for use inside an ffmpeg filter graph"""
+        path = os.path.abspath(path).replace('\\', '/')
+        path = path.replace(':', '\\:').replace("'", "'\\''")
+        return f"'{path}'"
+
     def get_video_info(self, video_path):
         """Get basic video information"""
         try:
-            video = mp.VideoFileClip(video_path)
+            # ffprobe only reads the container headers; no decoder is opened
+            command = [
+                'ffprobe', '-v', 'error',
+                '-select_streams', 'v:0',
+                '-show_entries', 'stream=width,height,r_frame_rate,duration:format=duration',
+                '-of', 'json',
+                video_path
+            ]
+
+            try:
+                result = subprocess.run(command, capture_output=True, text=True)
+            except FileNotFoundError:
+                raise Exception("ffprobe executable not found")
+
+            if result.returncode != 0:
+                raise Exception(f"ffprobe failed: {result.stderr.strip()}")
+
+            probe = json.loads(result.stdout)
+            streams = probe.get('streams') or []
+            if not streams:
+                raise Exception("No video stream found")
+            stream = streams[0]
+
+            # Matroska/WebM only carry the duration on the container
+            duration = stream.get('duration') or probe.get('format', {}).get('duration')
+
+            # r_frame_rate is a fraction such as "30000/1001"; "0/0" means unknown
+            try:
+                fps = float(Fraction(stream.get('r_frame_rate', '0/1')))
+            except (ValueError, ZeroDivisionError):
+                fps = 0.0
+
             info = {
-                'duration': video.duration,
-                'fps': video.fps,
-                'size': video.size
+                'duration': float(duration) if duration is not None else None,
+                'fps': fps,
+                'size': [int(stream['width']), int(stream['height'])]
             }
-            video.close()
             return info
         except Exception as e:
-            raise Exception(f"Error getting video info: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error getting video info: {str(e)}")